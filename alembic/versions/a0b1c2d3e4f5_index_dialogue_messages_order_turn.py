@@ -0,0 +1,29 @@
+"""Индекс истории диалога по заказу и ходу
+
+История читается только целиком по заказу и в порядке ходов; у FK
+order_id индекса не было, и каждый ход диалога читал таблицу целиком.
+
+Revision ID: a0b1c2d3e4f5
+Revises: f9a0b1c2d3e4
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "a0b1c2d3e4f5"
+down_revision = "f9a0b1c2d3e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dialogue_messages_order_turn "
+            "ON dialogue_messages (order_id, turn_number)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_dialogue_messages_order_turn")
@@ -0,0 +1,39 @@
+"""HNSW-индекс для embedding фурнитуры
+
+Центроиды ivfflat считаются по данным на момент построения, а индекс
+пересоздавался при смене типа колонки, когда embeddings были обнулены
+до backfill. HNSW от этого не зависит и даёт сублинейный поиск сразу.
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "a3b4c5d6e7f8"
+down_revision = "f2a3b4c5d6e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_hardware_items_embedding")
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hardware_items_embedding
+            ON hardware_items
+            USING hnsw (embedding halfvec_cosine_ops)
+            WITH (m = 16, ef_construction = 64);
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_hardware_items_embedding")
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hardware_items_embedding
+            ON hardware_items
+            USING ivfflat (embedding halfvec_cosine_ops)
+            WITH (lists = 100);
+        """)
@@ -0,0 +1,29 @@
+"""Индекс bom_items.order_id
+
+Выгрузка заказа в 1С читает позиции BOM по order_id; у внешнего ключа
+индекса не было.
+
+Revision ID: b1c2d3e4f5a7
+Revises: a0b1c2d3e4f5
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "b1c2d3e4f5a7"
+down_revision = "a0b1c2d3e4f5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_bom_items_order_id "
+            "ON bom_items (order_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_bom_items_order_id")
@@ -0,0 +1,36 @@
+"""Индексы фильтров каталога фурнитуры
+
+Поиск по артикулу (get_hardware_details, проверка совместимости, импорт)
+фильтрует только по sku, а уникальный индекс (brand, sku) начинается
+с brand и для этого не подходит. ИИ-поиск отбирает активные позиции
+по типу — для него частичный индекс по type WHERE is_active.
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "b4c5d6e7f8a9"
+down_revision = "a3b4c5d6e7f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_hardware_items_sku "
+            "ON hardware_items (sku)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_hardware_items_active_type "
+            "ON hardware_items (type) WHERE is_active"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_hardware_items_active_type")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_hardware_items_sku")
@@ -0,0 +1,57 @@
+"""JSON → JSONB для словарных колонок
+
+jsonb хранится в разобранном бинарном виде: операторы ->/->> и @> не
+парсят текст на каждой строке, а колонку можно индексировать (GIN),
+когда появятся запросы по содержимому. Манифесты производства
+(manufacturing_revisions.spec/provenance) и drilling_points остаются json —
+там важен исходный порядок ключей.
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "c5d6e7f8a9b0"
+down_revision = "b4c5d6e7f8a9"
+branch_labels = None
+depends_on = None
+
+# (таблица, колонка, server default)
+JSONB_COLUMNS = (
+    ("factories", "settings", "'{}'"),
+    ("product_configs", "params", "'{}'"),
+    ("suppliers", "meta", "'{}'"),
+    ("hardware_items", "params", "'{}'"),
+    ("hardware_items", "compat", "'[]'"),
+    ("bom_items", "params", "'{}'"),
+    ("cam_jobs", "context", "'{}'"),
+    ("audit_logs", "details", "'{}'"),
+    ("validation_items", "current_value", None),
+    ("validation_items", "proposed_value", None),
+)
+
+
+def _retype(target: str) -> None:
+    # Default снимаем и ставим заново: автоматического приведения
+    # выражения default между json и jsonb у Postgres нет.
+    for table, column, default in JSONB_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {target} USING {column}::{target}"
+        )
+        if default is not None:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"SET DEFAULT {default}::{target}"
+            )
+
+
+def upgrade() -> None:
+    _retype("jsonb")
+
+
+def downgrade() -> None:
+    _retype("json")
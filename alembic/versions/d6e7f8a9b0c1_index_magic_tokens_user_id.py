@@ -0,0 +1,32 @@
+"""Индекс magic_tokens.user_id
+
+При входе удаляются использованные и просроченные токены пользователя,
+чтобы таблица не росла бесконечно. Без индекса по user_id такая чистка
+(как и ON DELETE CASCADE от users) читает всю таблицу.
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "d6e7f8a9b0c1"
+down_revision = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_magic_tokens_user_id "
+            "ON magic_tokens (user_id)"
+        )
+    # Накопленный мусор до появления чистки при входе
+    op.execute("DELETE FROM magic_tokens WHERE used OR expires_at < now() - interval '1 day'")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_magic_tokens_user_id")
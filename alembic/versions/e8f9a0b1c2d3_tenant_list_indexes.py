@@ -0,0 +1,35 @@
+"""Индексы списков заказов и CAM-задач фабрики
+
+orders фильтруются по factory_id и сортируются по created_at, cam_jobs
+соединяются с заказами по order_id. Ни у одного из внешних ключей
+индекса не было — списки читали таблицы целиком.
+
+Revision ID: e8f9a0b1c2d3
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "e8f9a0b1c2d3"
+down_revision = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_factory_created "
+            "ON orders (factory_id, created_at)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cam_jobs_order_created "
+            "ON cam_jobs (order_id, created_at)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_cam_jobs_order_created")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_orders_factory_created")
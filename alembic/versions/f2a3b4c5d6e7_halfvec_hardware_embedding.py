@@ -0,0 +1,47 @@
+"""halfvec для embedding фурнитуры
+
+Векторы хранятся в половинной точности: строка bge-m3 занимает 2 КиБ
+вместо 4 КиБ, ANN-индекс вдвое меньше и лучше помещается в память.
+Для косинусного поиска точности fp16 достаточно, пересчёт не нужен —
+значения приводятся на месте.
+
+Revision ID: f2a3b4c5d6e7
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "f2a3b4c5d6e7"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def _rebuild_index(opclass: str) -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hardware_items_embedding
+            ON hardware_items
+            USING ivfflat (embedding {opclass})
+            WITH (lists = 100);
+        """)
+
+
+def upgrade() -> None:
+    # Индекс привязан к opclass vector_cosine_ops — пересоздаём под halfvec
+    op.execute("DROP INDEX IF EXISTS idx_hardware_items_embedding")
+    op.execute(
+        "ALTER TABLE hardware_items "
+        "ALTER COLUMN embedding TYPE halfvec(1024) USING embedding::halfvec(1024)"
+    )
+    _rebuild_index("halfvec_cosine_ops")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_hardware_items_embedding")
+    op.execute(
+        "ALTER TABLE hardware_items "
+        "ALTER COLUMN embedding TYPE vector(1024) USING embedding::vector(1024)"
+    )
+    _rebuild_index("vector_cosine_ops")
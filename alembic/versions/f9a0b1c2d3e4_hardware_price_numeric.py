@@ -0,0 +1,31 @@
+"""Цена фурнитуры в numeric(10, 2)
+
+float8 не хранит копейки точно: 199.99 превращается в 199.98999...,
+а суммы по смете расходятся с прайсом. numeric считает деньги точно,
+как уже сделано для supplier_prices.price.
+
+Revision ID: f9a0b1c2d3e4
+Revises: e8f9a0b1c2d3
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "f9a0b1c2d3e4"
+down_revision = "e8f9a0b1c2d3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE hardware_items "
+        "ALTER COLUMN price_rub TYPE numeric(10, 2) USING round(price_rub::numeric, 2)"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE hardware_items "
+        "ALTER COLUMN price_rub TYPE double precision USING price_rub::double precision"
+    )
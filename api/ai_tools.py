@@ -13,13 +13,16 @@ AI-инструменты (Function Calling) для ИИ-технолога.
 from __future__ import annotations
 
 import logging
+from decimal import Decimal
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.orm import defer
 
 from api.constants import DEFAULT_THICKNESS_MM
 from api.database import SessionLocal
 from api.models import HardwareItem
+from api.vector_search import set_hnsw_ef_search
 from shared.embeddings import embed_text
 
 log = logging.getLogger(__name__)
@@ -190,6 +193,21 @@ HARDWARE_TOOLS: list[dict[str, Any]] = [
 ]
 
 
+# Маппинг материалов на теги совместимости (HardwareItem.compat)
+MATERIAL_COMPAT_TAGS: dict[str, tuple[str, ...]] = {
+    "лдсп": ("ldsp", "лдсп", "dsp"),
+    "мдф": ("mdf", "мдф"),
+    "дсп": ("dsp", "дсп", "ldsp"),
+    "массив": ("solid", "массив", "wood"),
+    "фанера": ("plywood", "фанера"),
+}
+
+
+def _price_for_json(price: Decimal | None) -> float | None:
+    """Цена в ответе инструмента: результат уходит в модель через json.dumps."""
+    return float(price) if price is not None else None
+
+
 # ============================================================================
 # Обработчики инструментов
 # ============================================================================
@@ -276,9 +294,12 @@ async def handle_find_hardware(
             # Строим запрос с k-NN поиском
             stmt = (
                 select(HardwareItem)
+                # Сам вектор в ответе не нужен — не тянем его по сети
+                .options(defer(HardwareItem.embedding))
                 .where(HardwareItem.embedding.isnot(None))
                 .where(HardwareItem.is_active == True)
-                .order_by(HardwareItem.embedding.l2_distance(query_embedding))
+                # Косинус — под него построен HNSW-индекс, L2 шёл бы перебором
+                .order_by(HardwareItem.embedding.cosine_distance(query_embedding))
                 .limit(limit * 2)  # Берём больше для фильтрации
             )
 
@@ -286,6 +307,7 @@ async def handle_find_hardware(
             if hardware_type:
                 stmt = stmt.where(HardwareItem.type == hardware_type)
 
+            await set_hnsw_ef_search(db, limit * 2)
             result = await db.execute(stmt)
             items = result.scalars().all()
 
@@ -299,7 +321,7 @@ async def handle_find_hardware(
                 "type": item.type,
                 "category": item.category,
                 "description": item.description[:200] + "..." if item.description and len(item.description) > 200 else item.description,
-                "price_rub": item.price_rub,
+                "price_rub": _price_for_json(item.price_rub),
                 "params": item.params,
                 "compat": item.compat,
                 "thickness_range": f"{item.thickness_min_mm or '?'}-{item.thickness_max_mm or '?'} мм"
@@ -343,6 +365,7 @@ async def handle_check_hardware_compatibility(
         async with SessionLocal() as db:
             result = await db.execute(
                 select(HardwareItem)
+                .options(defer(HardwareItem.embedding))
                 .where(HardwareItem.sku == sku)
                 .order_by(HardwareItem.brand.asc().nulls_last(), HardwareItem.id.asc())
                 .limit(1)
@@ -373,18 +396,9 @@ async def handle_check_hardware_compatibility(
         material_ok = False
         material_message = "Материал не указан в совместимости"
 
-        # Маппинг материалов на теги совместимости
-        material_tags = {
-            "лдсп": ["ldsp", "лдсп", "dsp"],
-            "мдф": ["mdf", "мдф"],
-            "дсп": ["dsp", "дсп", "ldsp"],
-            "массив": ["solid", "массив", "wood"],
-            "фанера": ["plywood", "фанера"],
-        }
-
         compat_lower = [c.lower() for c in (item.compat or [])]
 
-        for mat_key, tags in material_tags.items():
+        for mat_key, tags in MATERIAL_COMPAT_TAGS.items():
             if mat_key in material_lower:
                 for tag in tags:
                     if any(tag in c for c in compat_lower):
@@ -441,6 +455,7 @@ async def handle_get_hardware_details(sku: str) -> dict[str, Any]:
         async with SessionLocal() as db:
             result = await db.execute(
                 select(HardwareItem)
+                .options(defer(HardwareItem.embedding))
                 .where(HardwareItem.sku == sku)
                 .order_by(HardwareItem.brand.asc().nulls_last(), HardwareItem.id.asc())
                 .limit(1)
@@ -468,7 +483,7 @@ async def handle_get_hardware_details(sku: str) -> dict[str, Any]:
                 "material_type": item.material_type,
                 "thickness_min_mm": item.thickness_min_mm,
                 "thickness_max_mm": item.thickness_max_mm,
-                "price_rub": item.price_rub,
+                "price_rub": _price_for_json(item.price_rub),
                 "url": item.url,
                 "is_active": item.is_active
             }
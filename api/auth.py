@@ -17,7 +17,7 @@ import jwt
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -285,9 +285,19 @@ async def login(
     user = result.scalar_one_or_none()
 
     if user:
+        # Использованные и просроченные токены пользователя больше не нужны:
+        # таблица и индекс по token остаются размером с живые ссылки.
+        now = datetime.now(UTC)
+        await db.execute(
+            delete(MagicToken).where(
+                MagicToken.user_id == user.id,
+                or_(MagicToken.used, MagicToken.expires_at <= now),
+            )
+        )
+
         # Создаём magic token
         token = secrets.token_urlsafe(32)
-        expires_at = datetime.now(UTC) + timedelta(minutes=settings.MAGIC_TOKEN_EXPIRE_MINUTES)
+        expires_at = now + timedelta(minutes=settings.MAGIC_TOKEN_EXPIRE_MINUTES)
         magic_token = MagicToken(
             user_id=user.id,
             token=token,
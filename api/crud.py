@@ -5,7 +5,7 @@ from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from api.manufacturing.contracts import ManufacturingSpec
 from api.manufacturing.coordinates import spec_hash
@@ -55,7 +55,10 @@ async def get_order_with_history(db: AsyncSession, order_id: UUID) -> models.Ord
     stmt = (
         select(models.Order)
         .where(models.Order.id == order_id)
-        .options(selectinload(models.Order.dialogue_messages))
+        .options(
+            selectinload(models.Order.dialogue_messages),
+            raiseload("*", sql_only=True),
+        )
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
@@ -82,12 +85,18 @@ async def create_dialogue_message(
 
 
 async def get_order_with_products(db: AsyncSession, order_id: UUID) -> models.Order | None:
-    """Получить заказ с его изделиями и панелями."""
+    """Получить заказ с его изделиями.
+
+    Панели изделий здесь не нужны: маршруты читают их отдельным запросом,
+    а удаление изделия каскадит их в БД. Остальные связи закрыты raiseload —
+    случайная ленивая подгрузка падает сразу, а не превращается в N+1.
+    """
     stmt = (
         select(models.Order)
         .where(models.Order.id == order_id)
         .options(
-            selectinload(models.Order.products).selectinload(models.ProductConfig.panels)
+            selectinload(models.Order.products).raiseload("*", sql_only=True),
+            raiseload("*", sql_only=True),
         )
     )
     result = await db.execute(stmt)
@@ -24,7 +24,16 @@ class Base(DeclarativeBase):
     pass
 
 
-engine: AsyncEngine = create_async_engine(_make_database_url(), echo=False, pool_pre_ping=True)
+engine: AsyncEngine = create_async_engine(
+    _make_database_url(),
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE_SECONDS,
+    # JIT на коротких OLTP-запросах только добавляет время планирования
+    connect_args={"server_settings": {"jit": "off"}},
+)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
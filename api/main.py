@@ -1,21 +1,40 @@
-import io
+import asyncio
+import atexit
+import importlib
 import json
 import logging
 import os
+import queue
 import sys
 import time
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
-# Фикс кодировки для Windows консоли (cp1251 -> utf-8)
+# Фикс кодировки для Windows консоли (cp1251 -> utf-8).
+# reconfigure() меняет поток на месте, повторный импорт ничего не оборачивает заново.
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    for _stream in (sys.stdout, sys.stderr):
+        if hasattr(_stream, "reconfigure") and (_stream.encoding or "").lower() != "utf-8":
+            _stream.reconfigure(encoding="utf-8", errors="replace")
+
+# Настройка логирования: обработчики пишут из очереди в отдельном потоке,
+# чтобы вывод в консоль не блокировал event loop на каждом запросе.
+# Слушатель живёт весь процесс: QueueHandler остаётся на root-логгере и после
+# остановки приложения, поэтому очередь дочищается только при выходе (atexit).
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(
+    "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
-)
+))
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+_log_queue_handler = QueueHandler(_log_queue)
+# Итоговое форматирование делает _log_stream_handler в потоке слушателя.
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Уменьшаем шум от библиотек
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -26,6 +45,10 @@ from dotenv import load_dotenv
 # Загружаем .env ДО импорта остальных модулей
 load_dotenv()
 
+# В production access-лог uvicorn дублирует api.request события и съедает пропускную способность.
+if os.environ.get("APP_ENVIRONMENT", "dev").lower() in {"prod", "production"}:
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
 log = logging.getLogger(__name__)
 
 from fastapi import FastAPI, Request
@@ -42,7 +65,37 @@ from .routers import router as api_v1
 from .routes.manufacturing import router as manufacturing_router
 from .routes.product_analytics import router as analytics_router
 
-app = FastAPI(title="Furniture AI API", version="0.1.0")
+# Тяжёлые модули, которые роутеры импортируют лениво (PyMuPDF, openpyxl,
+# калькулятор панелей). Прогреваем их при старте, чтобы первый запрос
+# на экспорт не платил за импорт.
+_PRELOAD_MODULES: tuple[str, ...] = (
+    "api.panel_calculator",
+    "api.pdf_generator",
+    "api.export_1c",
+)
+
+
+async def _preload_heavy_modules() -> None:
+    """Импортировать тяжёлые модули параллельно в пуле потоков."""
+    results = await asyncio.gather(
+        *(asyncio.to_thread(importlib.import_module, name) for name in _PRELOAD_MODULES),
+        return_exceptions=True,
+    )
+    for name, outcome in zip(_PRELOAD_MODULES, results, strict=True):
+        if isinstance(outcome, BaseException):
+            log.warning("Preload of %s failed: %s", name, outcome)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Startup-валидация окружения и закрытие внешних клиентов при остановке."""
+    await _validate_runtime()
+    await _preload_heavy_modules()
+    yield
+    await shutdown_event()
+
+
+app = FastAPI(title="Furniture AI API", version="0.1.0", lifespan=_lifespan)
 
 # ── Observability context: release/environment from env ───────────
 _RELEASE = os.environ.get("APP_RELEASE", "dev")
@@ -95,12 +148,23 @@ _cors_origins = _parse_cors_origins(_cors_raw) if _cors_raw else [
 ]
 log.info("CORS origins: %s", _cors_origins)
 
+# Явные методы/заголовки вместо «*»: preflight не эхо-копирует запрошенные
+# заголовки, а max_age позволяет браузеру кэшировать ответ на сутки.
+_CORS_ALLOW_METHODS = ["GET", "POST", "PATCH", "DELETE", "OPTIONS"]
+_CORS_ALLOW_HEADERS = [
+    "Authorization",
+    "Content-Type",
+    "X-Guest-Capability",
+    "X-Guest-Upload-Grant",
+]
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=_CORS_ALLOW_METHODS,
+    allow_headers=_CORS_ALLOW_HEADERS,
+    max_age=86400,
 )
 
 
@@ -181,7 +245,6 @@ async def _observability_middleware(request: Request, call_next):
 
 
 # ── Startup validation: fail closed for production ───────────────
-@app.on_event("startup")
 async def _validate_runtime():
     """Validate env at startup boundary. Fail closed for production."""
     result = validate_runtime_settings()
@@ -202,13 +265,15 @@ async def _validate_runtime():
     _emit_event("app.startup.success", {"version": app.version})
 
 
+_HEALTH_OK: dict[str, str] = {"status": "ok"}
+
+
 @app.get("/health")
-def health() -> dict:
+async def health() -> dict:
     """Простейшая проверка доступности сервиса."""
-    return {"status": "ok"}
+    return _HEALTH_OK
 
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Закрыть внешние HTTP-клиенты при остановке сервера."""
     _emit_event("app.shutdown", {})
@@ -218,6 +283,9 @@ async def shutdown_event():
     from .payments import get_yookassa_client
     await get_yookassa_client().close()
 
+    from .vector_search import close_search_cache
+    await close_search_cache()
+
 
 app.include_router(api_v1)
 app.include_router(dialogue_router)
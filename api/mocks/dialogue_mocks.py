@@ -3,81 +3,152 @@ Mock ответы для диалога с ИИ-технологом.
 Используется для локальной разработки когда нет AI API ключей.
 """
 import asyncio
+import functools
 import logging
+import os
 import random
-from collections.abc import AsyncGenerator
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Sequence
+from types import MappingProxyType
+from typing import Any
 
 log = logging.getLogger(__name__)
 
+# Собственный генератор модуля (сид из os.urandom), не общий random._inst
+_rng = random.Random()
+
+
+def _pick(options: Sequence[str]) -> str:
+    """Случайный элемент последовательности через _rng.randrange."""
+    return options[_rng.randrange(len(options))]
+
+
 # Базовые mock ответы ИИ-технолога в зависимости от этапа диалога
-MOCK_DIALOGUE_STAGES = {
-    "initial": [
+MOCK_DIALOGUE_STAGES: dict[str, tuple[str, ...]] = {
+    "initial": (
         "Здравствуйте! Я изучил параметры вашего заказа. Давайте проверим и уточним все детали для подготовки к производству.",
         "Добрый день! Спасибо за предоставленные данные. Я ИИ-технолог платформы «АвтоРаскрой». Давайте вместе финализируем спецификацию.",
         "Приветствую! Я получил первичные данные по изделию. Сейчас проведу проверку и задам несколько уточняющих вопросов."
-    ],
+    ),
 
-    "dimensions": [
+    "dimensions": (
         "Отлично! Теперь уточним размеры. Какие габариты изделия планируются? (укажите ширину × высота × глубина в мм)",
         "Хорошо. Следующий важный момент — точные размеры. Нужны габариты в формате: ширина × высота × глубина (в миллиметрах).",
         "Понял. Теперь про размеры — какие точные габариты должны быть у изделия? Укажите, пожалуйста, в миллиметрах."
-    ],
+    ),
 
-    "materials": [
+    "materials": (
         "Отлично, размеры записал. Теперь про материалы. Какой материал для корпуса предпочитаете: ЛДСП, МДФ или массив?\n[BUTTONS: \"ЛДСП\", \"МДФ\", \"Массив\"]",
         "Понял по размерам. Теперь важный момент — материал корпуса. Обычно используют ЛДСП 16 мм, МДФ 16 мм или массив. Что выберем?\n[BUTTONS: \"ЛДСП 16мм\", \"МДФ 16мм\", \"Массив\"]",
         "Размеры зафиксировал. Следующий вопрос — какой материал для фасадов: МДФ с плёнкой ПВХ, МДФ с эмалью, или массив?\n[BUTTONS: \"МДФ с ПВХ\", \"МДФ эмаль\", \"Массив\"]"
-    ],
+    ),
 
-    "thickness": [
+    "thickness": (
         "Хорошо, материал выбран. Уточните толщину панелей для корпуса — стандартные варианты: 16 мм или 18 мм?\n[BUTTONS: \"16 мм\", \"18 мм\", \"Другая толщина\"]",
         "Отлично. Теперь по толщине материала — для фасадов обычно используют 16 мм или 18 мм. Какая толщина нужна?\n[BUTTONS: \"16 мм\", \"18 мм\"]",
-    ],
+    ),
 
-    "edge": [
+    "edge": (
         "Понял. Теперь важный момент — кромкование. Для видимых торцов используем кромку ПВХ 1 мм или 2 мм?\n[BUTTONS: \"ПВХ 1 мм\", \"ПВХ 2 мм\", \"Без кромки\"]",
         "Хорошо. Следующий вопрос по кромке — какая обработка торцов нужна: ПВХ 2 мм (премиум), ПВХ 1 мм (стандарт) или АБС?\n[BUTTONS: \"ПВХ 2 мм\", \"ПВХ 1 мм\", \"АБС\"]"
-    ],
+    ),
 
-    "hardware": [
+    "hardware": (
         "Отлично. Теперь про фурнитуру — нужны ли доводчики на петлях и направляющих? Это добавит +15-20% к стоимости фурнитуры.\n[BUTTONS: \"Да, с доводчиками\", \"Нет, обычные\"]",
         "Понял. По петлям — обычно для корпусной мебели используют петли Blum или Hettich. Какой бренд предпочитаете?\n[BUTTONS: \"Blum\", \"Hettich\", \"Эконом-вариант\"]",
         "Хорошо. Для выдвижных ящиков нужны направляющие. Стандартный вариант — шариковые направляющие полного выдвижения. Подойдут?\n[BUTTONS: \"Да, шариковые\", \"Нужны Tandembox\", \"Без ящиков\"]"
-    ],
+    ),
 
-    "color": [
+    "color": (
         "Отлично, фурнитуру зафиксировал. Последний момент — цвет и декор. Какой оттенок ЛДСП/МДФ нужен? (например: белый, дуб, венге)",
         "Хорошо. Теперь про цвет фасадов — у нас есть каталог декоров. Какой оттенок предпочитаете? Можете указать название или описать.",
-    ],
+    ),
 
-    "finalization": [
+    "finalization": (
         "Отлично! Все ключевые параметры согласованы:\n- Габариты зафиксированы\n- Материалы и толщины выбраны\n- Кромка определена\n- Фурнитура подобрана\n- Цвет/декор указан\n\nМожем переходить к формированию полной спецификации и CAM-программ?",
         "Превосходно! Все параметры проверены и согласованы. Спецификация готова к производству. Переходим к следующему этапу — формирование деталировки и программ для станков?",
         "Отлично поработали! Все данные собраны и проверены. Теперь система автоматически сформирует:\n- Полную спецификацию (BOM)\n- Карты раскроя\n- Программы для ЧПУ\n\nПереходим к генерации?"
-    ]
+    )
 }
 
 # Реакции на различные фразы пользователя
-MOCK_REACTIONS = {
-    "да": [
+MOCK_REACTIONS: dict[str, tuple[str, ...]] = {
+    "да": (
         "Отлично, понял!",
         "Хорошо, зафиксировал.",
         "Принято, двигаемся дальше.",
-    ],
-    "нет": [
+    ),
+    "нет": (
         "Хорошо, уточните, пожалуйста, что нужно изменить.",
         "Понял. Тогда подскажите правильный вариант.",
-    ],
-    "не знаю": [
+    ),
+    "не знаю": (
         "Понимаю. Давайте я предложу стандартные варианты для вашего типа изделия.",
         "Без проблем. Обычно в таких случаях используют следующие решения...",
-    ],
-    "спасибо": [
+    ),
+    "спасибо": (
         "Всегда рада помочь! Продолжаем?",
         "Пожалуйста! Двигаемся дальше.",
-    ]
+    )
 }
 
+# Распознавание намерений пользователя, в порядке проверки:
+# (ключевые слова, реакция, перейти к следующему этапу, добавить реплику этапа).
+# Порядок важен: «не подходит» содержит «подходит» и попадает в согласие.
+_MOCK_INTENTS: tuple[tuple[tuple[str, ...], tuple[str, ...], bool, bool], ...] = (
+    (("да", "ок", "хорошо", "согласен", "подходит"), MOCK_REACTIONS["да"], True, True),
+    (("нет", "не подходит", "другой"), MOCK_REACTIONS["нет"], False, False),
+    (("не знаю", "незнаю", "не уверен"), MOCK_REACTIONS["не знаю"], False, True),
+    (("спасибо", "благодарю"), MOCK_REACTIONS["спасибо"], False, False),
+)
+
+# Статические ответы mock-инструментов: собираются один раз при импорте
+# и не изменяются (кортежи и MappingProxyType вместо списков и словарей).
+# Наружу обработчики отдают свежие list/dict — результат уходит в json.dumps.
+MOCK_MATERIALS_BY_PANEL_TYPE = MappingProxyType({
+    "корпус": ("ЛДСП Egger", "ЛДСП Kronospan", "МДФ влагостойкая", "Массив сосны"),
+    "фасад": ("МДФ с плёнкой ПВХ", "МДФ эмаль", "Массив дуба", "ЛДСП с покрытием"),
+    "столешница": ("ЛДСП 38мм", "Искусственный камень", "Натуральный камень", "Массив"),
+})
+MOCK_DEFAULT_MATERIALS = ("ЛДСП", "МДФ", "Массив")
+
+MOCK_MATERIAL_PROPERTIES = MappingProxyType({
+    "доступные_толщины_мм": (16, 18, 22, 25),
+    "цвета": ("белый", "дуб натуральный", "венге", "графит"),
+    "текстура": "матовая/глянцевая",
+})
+
+MOCK_HARDWARE_COMPATIBLE = MappingProxyType({
+    "compatible": True,
+    "comment": "Фурнитура совместима с указанной толщиной панели.",
+})
+
+# Mock результаты поиска фурнитуры (find_hardware)
+MOCK_HARDWARE_SEARCH_RESULTS = (
+    MappingProxyType({
+        "sku": "BLUM-71B3550",
+        "название": "Blum CLIP top BLUMOTION петля накладная",
+        "цена": 450.00,
+        "описание": "Петля с доводчиком для накладных дверей",
+    }),
+    MappingProxyType({
+        "sku": "HETT-HD-3D",
+        "название": "Hettich Sensys петля накладная 3D",
+        "цена": 380.00,
+        "описание": "Петля с 3D регулировкой",
+    }),
+    MappingProxyType({
+        "sku": "GTV-ECON",
+        "название": "GTV петля накладная эконом",
+        "цена": 120.00,
+        "описание": "Экономичный вариант петли",
+    }),
+)
+
+# Размер среза текста при имитации streaming (символов)
+MOCK_STREAM_CHUNK_CHARS = 24
+
 # Ошибки и edge cases
 MOCK_ERROR_RESPONSES = [
     "Извините, не совсем понял ваш ответ. Не могли бы вы уточнить?",
@@ -85,37 +156,62 @@ MOCK_ERROR_RESPONSES = [
 ]
 
 
+# Порядок этапов диалога; состояние хранит только индекс в этом кортеже.
+_STAGE_ORDER = (
+    "initial", "dimensions", "materials", "thickness", "edge", "hardware", "color", "finalization",
+)
+# Ответы, выровненные по _STAGE_ORDER: индекс этапа сразу даёт набор реплик.
+_STAGE_RESPONSES = tuple(MOCK_DIALOGUE_STAGES[stage] for stage in _STAGE_ORDER)
+
+
 class MockDialogueState:
     """Отслеживание состояния mock диалога для более естественных ответов."""
 
+    __slots__ = ("stage_index",)
+
     def __init__(self):
-        self.current_stage = "initial"
-        self.asked_questions = set()
-        self.stage_order = ["initial", "dimensions", "materials", "thickness", "edge", "hardware", "color", "finalization"]
         self.stage_index = 0
 
+    @property
+    def current_stage(self) -> str:
+        """Текущий этап диалога."""
+        return _STAGE_ORDER[self.stage_index]
+
     def get_next_stage(self) -> str:
         """Переход к следующему этапу диалога."""
-        if self.stage_index < len(self.stage_order) - 1:
+        if self.stage_index < len(_STAGE_ORDER) - 1:
             self.stage_index += 1
-            self.current_stage = self.stage_order[self.stage_index]
         return self.current_stage
 
     def get_current_response(self) -> str:
         """Получить ответ для текущего этапа."""
-        responses = MOCK_DIALOGUE_STAGES.get(self.current_stage, MOCK_DIALOGUE_STAGES["initial"])
-        return random.choice(responses)
+        return _pick(_STAGE_RESPONSES[self.stage_index])
+
 
+# Глобальное состояние для разных заказов (в реальности это должно быть в Redis/БД).
+# Ограничено по размеру (LRU) и по времени жизни, чтобы долгоживущий процесс
+# в mock-режиме не копил состояния всех когда-либо открытых заказов.
+DIALOGUE_STATES_MAX_SIZE = 1024
+DIALOGUE_STATE_TTL_SECONDS = 3600.0
 
-# Глобальное состояние для разных заказов (в реальности это должно быть в Redis/БД)
-_dialogue_states = {}
+_dialogue_states: OrderedDict[int, tuple[float, MockDialogueState]] = OrderedDict()
 
 
 def get_dialogue_state(order_id: int) -> MockDialogueState:
     """Получить или создать состояние диалога для заказа."""
-    if order_id not in _dialogue_states:
-        _dialogue_states[order_id] = MockDialogueState()
-    return _dialogue_states[order_id]
+    now = time.monotonic()
+    entry = _dialogue_states.get(order_id)
+    if entry is not None and now - entry[0] < DIALOGUE_STATE_TTL_SECONDS:
+        state = entry[1]
+    else:
+        state = MockDialogueState()
+    _dialogue_states[order_id] = (now, state)
+    # Присваивание существующему ключу не меняет его позицию в OrderedDict —
+    # переносим в конец и свежие, и пересозданные после TTL записи.
+    _dialogue_states.move_to_end(order_id)
+    while len(_dialogue_states) > DIALOGUE_STATES_MAX_SIZE:
+        _dialogue_states.popitem(last=False)
+    return state
 
 
 async def generate_mock_dialogue_response(
@@ -137,7 +233,7 @@ async def generate_mock_dialogue_response(
     Yields:
         Части ответа (chunks) для имитации streaming
     """
-    log.info(f"[MOCK MODE] Generating dialogue response for order {order_id}")
+    log.info("[MOCK MODE] Generating dialogue response for order %s", order_id)
 
     state = get_dialogue_state(order_id)
 
@@ -159,21 +255,23 @@ async def generate_mock_dialogue_response(
         # Если сообщение пустое — используем дефолтный ответ
         if not message_lower:
             response_text = state.get_current_response()
-        # Простая реакция на базовые ответы
-        elif any(word in message_lower for word in ["да", "ок", "хорошо", "согласен", "подходит"]):
-            # Переходим к следующему этапу
-            state.get_next_stage()
-            response_text = random.choice(MOCK_REACTIONS["да"]) + " " + state.get_current_response()
-        elif any(word in message_lower for word in ["нет", "не подходит", "другой"]):
-            response_text = random.choice(MOCK_REACTIONS["нет"])
-        elif any(word in message_lower for word in ["не знаю", "незнаю", "не уверен"]):
-            response_text = random.choice(MOCK_REACTIONS["не знаю"]) + " " + state.get_current_response()
-        elif any(word in message_lower for word in ["спасибо", "благодарю"]):
-            response_text = random.choice(MOCK_REACTIONS["спасибо"])
         else:
-            # Для любого другого ответа — двигаемся дальше
-            state.get_next_stage()
-            response_text = state.get_current_response()
+            # Простая реакция на базовые ответы
+            for keywords, reactions, advance, with_stage_reply in _MOCK_INTENTS:
+                if any(word in message_lower for word in keywords):
+                    if advance:
+                        # Переходим к следующему этапу
+                        state.get_next_stage()
+                    response_text = (
+                        " ".join((_pick(reactions), state.get_current_response()))
+                        if with_stage_reply
+                        else _pick(reactions)
+                    )
+                    break
+            else:
+                # Для любого другого ответа — двигаемся дальше
+                state.get_next_stage()
+                response_text = state.get_current_response()
 
     # Inline режим: если переданы текущие параметры, пытаемся вытащить обновления из текста пользователя
     # и вернуть их в ожидаемом системой формате.
@@ -185,17 +283,17 @@ async def generate_mock_dialogue_response(
             response_text += json.dumps(patch, ensure_ascii=True)
             response_text += "\n[/PARAM_UPDATE]\n"
 
-    # Имитация streaming: отдаём текст по словам с небольшой задержкой
-    words = response_text.split()
-    for i, word in enumerate(words):
-        # Добавляем пробел перед словом (кроме первого)
-        chunk = word if i == 0 else f" {word}"
-        yield chunk
+    # Имитация streaming: отдаём готовый текст срезами фиксированной длины
+    # с небольшой задержкой, без пересборки строки по словам.
+    chunk_count = 0
+    for start in range(0, len(response_text), MOCK_STREAM_CHUNK_CHARS):
+        yield response_text[start:start + MOCK_STREAM_CHUNK_CHARS]
+        chunk_count += 1
 
         # Небольшая задержка для реалистичности (10-50мс)
-        await asyncio.sleep(random.uniform(0.01, 0.05))
+        await asyncio.sleep(_rng.uniform(0.01, 0.05))
 
-    log.info(f"[MOCK MODE] Response generated for order {order_id}: {len(words)} words")
+    log.info("[MOCK MODE] Response generated for order %s: %s chunks", order_id, chunk_count)
 
 
 def _extract_param_patch_from_text(text: str) -> dict:
@@ -262,6 +360,39 @@ def _extract_param_patch_from_text(text: str) -> dict:
     return patch
 
 
+def _mock_available_materials(panel_type: str = "корпус", **_: Any) -> list[str]:
+    return list(MOCK_MATERIALS_BY_PANEL_TYPE.get(panel_type, MOCK_DEFAULT_MATERIALS))
+
+
+def _mock_material_properties(material_name: str = "", **_: Any) -> dict:
+    # Упрощённый mock
+    return {
+        "название": material_name,
+        **{
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in MOCK_MATERIAL_PROPERTIES.items()
+        },
+    }
+
+
+def _mock_hardware_compatibility(**_: Any) -> dict:
+    # Всегда возвращаем совместимость в mock режиме
+    return dict(MOCK_HARDWARE_COMPATIBLE)
+
+
+def _mock_find_hardware(query: str = "", **_: Any) -> list[dict]:
+    # query пока не используется — результаты поиска статические
+    return [dict(item) for item in MOCK_HARDWARE_SEARCH_RESULTS]
+
+
+MOCK_FUNCTION_HANDLERS = {
+    "get_available_materials": _mock_available_materials,
+    "get_material_properties": _mock_material_properties,
+    "check_hardware_compatibility": _mock_hardware_compatibility,
+    "find_hardware": _mock_find_hardware,
+}
+
+
 async def mock_function_call_response(function_name: str, **kwargs) -> dict:
     """
     Mock ответы для function calling инструментов.
@@ -271,65 +402,23 @@ async def mock_function_call_response(function_name: str, **kwargs) -> dict:
         **kwargs: Параметры функции
 
     Returns:
-        Mock результат выполнения функции
+        Mock результат выполнения функции (копия, пригодная для json.dumps)
     """
-    log.info(f"[MOCK MODE] Function call: {function_name} with params {kwargs}")
-
-    if function_name == "get_available_materials":
-        panel_type = kwargs.get("panel_type", "корпус")
-        return {
-            "корпус": ["ЛДСП Egger", "ЛДСП Kronospan", "МДФ влагостойкая", "Массив сосны"],
-            "фасад": ["МДФ с плёнкой ПВХ", "МДФ эмаль", "Массив дуба", "ЛДСП с покрытием"],
-            "столешница": ["ЛДСП 38мм", "Искусственный камень", "Натуральный камень", "Массив"]
-        }.get(panel_type, ["ЛДСП", "МДФ", "Массив"])
-
-    elif function_name == "get_material_properties":
-        material_name = kwargs.get("material_name", "")
-        # Упрощённый mock
-        return {
-            "название": material_name,
-            "доступные_толщины_мм": [16, 18, 22, 25],
-            "цвета": ["белый", "дуб натуральный", "венге", "графит"],
-            "текстура": "матовая/глянцевая"
-        }
-
-    elif function_name == "check_hardware_compatibility":
-        # Всегда возвращаем совместимость в mock режиме
-        return {
-            "compatible": True,
-            "comment": "Фурнитура совместима с указанной толщиной панели."
-        }
-
-    elif function_name == "find_hardware":
-        _query = kwargs.get("query", "")  # noqa: F841 - для будущего использования
-        # Mock результаты поиска фурнитуры
-        return [
-            {
-                "sku": "BLUM-71B3550",
-                "название": "Blum CLIP top BLUMOTION петля накладная",
-                "цена": 450.00,
-                "описание": "Петля с доводчиком для накладных дверей"
-            },
-            {
-                "sku": "HETT-HD-3D",
-                "название": "Hettich Sensys петля накладная 3D",
-                "цена": 380.00,
-                "описание": "Петля с 3D регулировкой"
-            },
-            {
-                "sku": "GTV-ECON",
-                "название": "GTV петля накладная эконом",
-                "цена": 120.00,
-                "описание": "Экономичный вариант петли"
-            }
-        ]
+    if log.isEnabledFor(logging.INFO):
+        log.info("[MOCK MODE] Function call: %s with params %s", function_name, kwargs)
 
-    else:
+    handler = MOCK_FUNCTION_HANDLERS.get(function_name)
+    if handler is None:
         return {"error": f"Unknown function: {function_name}"}
+    return handler(**kwargs)
 
 
 # Вспомогательная функция для проверки наличия ключей AI-провайдера
+@functools.lru_cache(maxsize=1)
 def are_ai_keys_available() -> bool:
-    """Проверяет наличие ключей AI-провайдера."""
-    import os
+    """Проверяет наличие ключей AI-провайдера.
+
+    Окружение читается один раз после load_dotenv(); в тестах, меняющих
+    AI_API_KEY, сбрасывайте кэш через are_ai_keys_available.cache_clear().
+    """
     return bool(os.getenv("AI_API_KEY", "").strip())
@@ -3,13 +3,11 @@
 Запуск: python -m api.mocks.test_dialogue_mock
 """
 import asyncio
-import os
 import sys
 from pathlib import Path
 
 # Устанавливаем UTF-8 для Windows консоли
-if sys.platform == 'win32':
-    os.system('chcp 65001 >nul 2>&1')
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
 
 # Добавляем корень проекта в PYTHONPATH
@@ -3,10 +3,11 @@ from __future__ import annotations
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum as _EnumShim
+from enum import StrEnum
 from typing import Any
 from uuid import uuid4
 
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 
 
 def _embedding_dim_orm() -> int:
@@ -21,28 +22,31 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
+from .ids import uuid7
 
 # Примечание: Роли убраны для MVP (YAGNI). Добавим когда понадобится.
 
 
-class JobStatusEnum(str):
+class JobStatusEnum(StrEnum):
     Created = "Created"
     Processing = "Processing"
     Completed = "Completed"
     Failed = "Failed"
 
 
-class ValidationStatusEnum(str):
+class ValidationStatusEnum(StrEnum):
     Pending = "Pending"
     Approved = "Approved"
     Rejected = "Rejected"
@@ -57,11 +61,17 @@ class Factory(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
     # Настройки фабрики (станок, материалы, параметры генерации)
-    settings: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    settings: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
 
-    # Связи
-    users: Mapped[list[User]] = relationship(back_populates="factory", cascade="all, delete-orphan")
-    orders: Mapped[list[Order]] = relationship(back_populates="factory", cascade="all, delete-orphan")
+    # Связи. Коллекции грузятся явно через selectinload в запросе (async-сессия
+    # не умеет ленивую подгрузку). passive_deletes: дочерние строки удаляет
+    # ON DELETE CASCADE в БД, ORM не выгружает их ради удаления родителя.
+    users: Mapped[list[User]] = relationship(
+        back_populates="factory", cascade="all, delete-orphan", passive_deletes=True
+    )
+    orders: Mapped[list[Order]] = relationship(
+        back_populates="factory", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class User(Base):
@@ -86,8 +96,11 @@ class MagicToken(Base):
     """Токен для Magic Link входа (живёт 15 минут)."""
     __tablename__ = "magic_tokens"
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    # Индекс: чистка токенов пользователя при новом входе и ON DELETE CASCADE
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
     token: Mapped[str] = mapped_column(String(64), unique=True, index=True)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     used: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -99,6 +112,10 @@ class MagicToken(Base):
 class Order(Base):
     """Заказ мебели, принадлежит фабрике (мультитенантность)."""
     __tablename__ = "orders"
+    __table_args__ = (
+        # Список заказов фабрики: фильтр по тенанту + сортировка по дате одним range scan
+        Index("ix_orders_factory_created", "factory_id", "created_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     factory_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("factories.id", ondelete="CASCADE"), nullable=True)
@@ -117,8 +134,16 @@ class Order(Base):
     # Связи
     factory: Mapped[Factory | None] = relationship(back_populates="orders")
     created_by: Mapped[User | None] = relationship()
-    products: Mapped[list[ProductConfig]] = relationship(back_populates="order", cascade="all, delete-orphan")
-    dialogue_messages: Mapped[list[DialogueMessage]] = relationship(back_populates="order", cascade="all, delete-orphan")
+    products: Mapped[list[ProductConfig]] = relationship(
+        back_populates="order", cascade="all, delete-orphan", passive_deletes=True
+    )
+    # История всегда нужна по порядку ходов: сортирует БД по индексу (order_id, turn_number)
+    dialogue_messages: Mapped[list[DialogueMessage]] = relationship(
+        back_populates="order",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="(DialogueMessage.turn_number, DialogueMessage.timestamp)",
+    )
 
 
 class ProductConfig(Base):
@@ -131,16 +156,18 @@ class ProductConfig(Base):
     depth_mm: Mapped[float] = mapped_column(Float)
     material: Mapped[str | None] = mapped_column(String(80), nullable=True)
     thickness_mm: Mapped[float | None] = mapped_column(Float, nullable=True)
-    params: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    params: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     order: Mapped[Order] = relationship(back_populates="products")
-    panels: Mapped[list[Panel]] = relationship(back_populates="product", cascade="all, delete-orphan")
+    panels: Mapped[list[Panel]] = relationship(
+        back_populates="product", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class Panel(Base):
     __tablename__ = "panels"
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     product_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("product_configs.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(120))
     width_mm: Mapped[float] = mapped_column(Float)
@@ -169,7 +196,7 @@ class Supplier(Base):
     name: Mapped[str] = mapped_column(String(120))
     url: Mapped[str | None] = mapped_column(String(255), nullable=True)
     contact_email: Mapped[str | None] = mapped_column(String(120), nullable=True)
-    meta: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    meta: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
 
 class HardwareItem(Base):
     __tablename__ = "hardware_items"
@@ -179,6 +206,19 @@ class HardwareItem(Base):
             "sku",
             name="uq_hardware_items_brand_sku",
         ),
+        # HNSW вместо ivfflat: не требует обучения на данных и даёт стабильный recall
+        # при любом размере каталога. Создаётся миграцией CONCURRENTLY.
+        Index(
+            "idx_hardware_items_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+            postgresql_with={"m": 16, "ef_construction": 64},
+        ),
+        # uq_hardware_items_brand_sku начинается с brand и не обслуживает поиск по одному sku
+        Index("ix_hardware_items_sku", "sku"),
+        # Префильтр ИИ-поиска: только активные позиции нужного типа
+        Index("ix_hardware_items_active_type", "type", postgresql_where=text("is_active")),
     )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -188,14 +228,15 @@ class HardwareItem(Base):
     type: Mapped[str] = mapped_column(String(40))
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    params: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
-    compat: Mapped[list[str]] = mapped_column(JSON, default=list)
+    params: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+    compat: Mapped[list[str]] = mapped_column(JSONB, default=list)
     url: Mapped[str | None] = mapped_column(String(255), nullable=True)
     version: Mapped[str | None] = mapped_column(String(40), nullable=True)
     supplier_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("suppliers.id", ondelete="SET NULL"))
     
-    # Поля для векторного поиска (размерность из AISettings.ai_embedding_dim)
-    embedding: Mapped[list[float] | None] = mapped_column(Vector(_embedding_dim_orm()), nullable=True)
+    # Поля для векторного поиска (размерность из AISettings.ai_embedding_dim).
+    # halfvec: fp16 вдвое уменьшает строку и ANN-индекс, точности для косинуса хватает.
+    embedding: Mapped[list[float] | None] = mapped_column(HALFVEC(_embedding_dim_orm()), nullable=True)
     embedding_version: Mapped[str | None] = mapped_column(String(40), nullable=True)  # Версия модели эмбеддингов
     content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)  # Хеш контента для проверки актуальности
     indexed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # Время индексации
@@ -205,7 +246,7 @@ class HardwareItem(Base):
     material_type: Mapped[str | None] = mapped_column(String(40), nullable=True)  # Тип материала для совместимости
     thickness_min_mm: Mapped[float | None] = mapped_column(Float, nullable=True)  # Минимальная толщина материала
     thickness_max_mm: Mapped[float | None] = mapped_column(Float, nullable=True)  # Максимальная толщина материала
-    price_rub: Mapped[float | None] = mapped_column(Float, nullable=True)  # Цена в рублях
+    price_rub: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)  # Цена в рублях, копейки точно
     is_active: Mapped[bool] = mapped_column(default=True)  # Активность позиции
 
 
@@ -228,13 +269,17 @@ class SupplierPrice(Base):
 
 class BOMItem(Base):
     __tablename__ = "bom_items"
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    __table_args__ = (
+        # Выгрузка в 1С читает BOM заказа целиком по order_id
+        Index("ix_bom_items_order_id", "order_id"),
+    )
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     order_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="CASCADE"))
     sku: Mapped[str] = mapped_column(String(120))
     name: Mapped[str] = mapped_column(String(255))
     qty: Mapped[float] = mapped_column(Float)
     unit: Mapped[str] = mapped_column(String(20))
-    params: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    params: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
     supplier_sku: Mapped[str | None] = mapped_column(String(120), nullable=True)
     supplier_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("suppliers.id", ondelete="SET NULL"))
 
@@ -253,40 +298,43 @@ class Artifact(Base):
 
 class CAMJob(Base):
     __tablename__ = "cam_jobs"
+    __table_args__ = (
+        # Список CAM-задач фабрики идёт через join по order_id (у FK своего индекса нет)
+        Index("ix_cam_jobs_order_created", "order_id", "created_at"),
+    )
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     order_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="SET NULL"))
     job_kind: Mapped[str] = mapped_column(String(20))  # DXF | GCODE
     artifact_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("artifacts.id", ondelete="SET NULL"), nullable=True)
-    status: Mapped[str] = mapped_column(Enum(
-        JobStatusEnum.Created,
-        JobStatusEnum.Processing,
-        JobStatusEnum.Completed,
-        JobStatusEnum.Failed,
-        name="job_status",
-        native_enum=False,
-    ), default=JobStatusEnum.Created)
+    status: Mapped[JobStatusEnum] = mapped_column(
+        Enum(JobStatusEnum, name="job_status", native_enum=False, length=20),
+        default=JobStatusEnum.Created,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     attempt: Mapped[int] = mapped_column(Integer, default=0)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
-    context: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    context: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
     idempotency_key: Mapped[str | None] = mapped_column(String(50), unique=True, nullable=True)
 
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     actor_role: Mapped[str] = mapped_column(String(40))
     action: Mapped[str] = mapped_column(String(120))
     entity: Mapped[str] = mapped_column(String(40))
     entity_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True))
-    details: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    details: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
 
 
 class DialogueMessage(Base):
     __tablename__ = "dialogue_messages"
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    __table_args__ = (
+        Index("ix_dialogue_messages_order_turn", "order_id", "turn_number"),
+    )
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     order_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="CASCADE"))
     turn_number: Mapped[int] = mapped_column(Integer)
     role: Mapped[str] = mapped_column(String(20))  # user, assistant
@@ -301,13 +349,10 @@ class Validation(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     related_entity: Mapped[str] = mapped_column(String(40))
     related_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True))
-    status: Mapped[str] = mapped_column(Enum(
-        ValidationStatusEnum.Pending,
-        ValidationStatusEnum.Approved,
-        ValidationStatusEnum.Rejected,
-        name="validation_status",
-        native_enum=False,
-    ), default=ValidationStatusEnum.Pending)
+    status: Mapped[ValidationStatusEnum] = mapped_column(
+        Enum(ValidationStatusEnum, name="validation_status", native_enum=False, length=20),
+        default=ValidationStatusEnum.Pending,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
@@ -318,8 +363,8 @@ class ValidationItem(Base):
     validation_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("validations.id", ondelete="CASCADE"))
     key: Mapped[str] = mapped_column(String(80))
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    current_value: Mapped[Any | None] = mapped_column(JSON, nullable=True)
-    proposed_value: Mapped[Any | None] = mapped_column(JSON, nullable=True)
+    current_value: Mapped[Any | None] = mapped_column(JSONB, nullable=True)
+    proposed_value: Mapped[Any | None] = mapped_column(JSONB, nullable=True)
     status: Mapped[str] = mapped_column(String(20), default=ValidationStatusEnum.Pending)
     comment: Mapped[str | None] = mapped_column(Text, nullable=True)
 
@@ -13,7 +13,11 @@
 from __future__ import annotations
 
 import logging
+import math
+import operator
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 from api.constants import (
@@ -65,6 +69,46 @@ HINGE_CUP_DIAMETER_MM = 35.0          # Диаметр чашки
 HINGE_CUP_DEPTH_MM = 12.0             # Глубина фрезеровки
 HINGE_EDGE_OFFSET_MM = 22.0           # Отступ от края фасада
 HINGE_TOP_BOTTOM_OFFSET_MM = 100.0    # Отступ от верха/низа фасада
+
+# Значения полей "side" и "hardware_type" в словарях отверстий
+SIDE_FACE = "face"                    # Пласть
+SIDE_EDGE = "edge"                    # Торец
+HW_CONFIRMAT = "confirmat"
+HW_DOWEL = "dowel"
+HW_SHELF_PIN = "shelf_pin"
+HW_HINGE_CUP = "hinge_cup"
+HW_HINGE_MOUNT = "hinge_mount"
+HW_SLIDE = "slide"
+# Крепятся саморезами без присадки, если цех не работает на евровинт
+_SCREW_MOUNTED_HARDWARE = frozenset((HW_HINGE_MOUNT, HW_SLIDE))
+
+# Общие поля типовых отверстий; координаты добавляются при сборке
+_CONFIRMAT_FACE_HOLE = {
+    "diameter": CONFIRMAT_DIAMETER_MM,
+    "depth": CONFIRMAT_DEPTH_FACE_MM,
+    "side": SIDE_FACE,
+    "hardware_type": HW_CONFIRMAT,
+}
+_SHELF_PIN_HOLE = {
+    "diameter": SYSTEM32_DIAMETER_MM,
+    "depth": SYSTEM32_DEPTH_MM,
+    "side": SIDE_FACE,
+    "hardware_type": HW_SHELF_PIN,
+}
+
+# Примечания к панелям и предупреждения расчёта
+_NOTE_BACK_SLOT = "Паз под ДВП 4x10мм"
+_NOTE_FIXED_SHELF = "Конструкционная полка в распор"
+_NOTE_REMOVABLE_SHELF = "Съёмная полка на полкодержателях"
+_NOTE_DRAWER_BOTTOM = "ДВП 3мм"
+_WARN_SHELF_SAG = (
+    "Полка {width:.0f}мм может провиснуть (макс {max_span:.0f}мм). "
+    "Рекомендуется вертикальная перегородка."
+)
+
+# Съёмная полка короче проёма на зазор с каждой стороны
+_SHELF_WIDTH_GAP_MM = 2 * DEFAULT_SHELF_GAP_MM
+
 # Стандарты цеха по умолчанию. Единственный источник значений — api/constants.py,
 # поверх них ложатся настройки конкретного мастера.
 FASTENER_DEFAULTS = {
@@ -89,18 +133,29 @@ def _fastener_hole(
     x: float,
     y: float,
     side: str,
-    standards: dict[str, Any],
+    fastener_type: str,
 ) -> dict:
-    if standards["fastener_type"] == "dowel":
+    if fastener_type == "dowel":
         return {
             "x": x, "y": y, "diameter": 8.0, "depth": 24.0,
-            "side": side, "hardware_type": "dowel",
+            "side": side, "hardware_type": HW_DOWEL,
         }
     return {
         "x": x, "y": y, "diameter": CONFIRMAT_DIAMETER_MM,
-        "depth": CONFIRMAT_DEPTH_FACE_MM if side == "face" else CONFIRMAT_DEPTH_EDGE_MM,
-        "side": side, "hardware_type": "confirmat",
+        "depth": CONFIRMAT_DEPTH_FACE_MM if side == SIDE_FACE else CONFIRMAT_DEPTH_EDGE_MM,
+        "side": side, "hardware_type": HW_CONFIRMAT,
     }
+
+
+def _shelf_sag_warning(shelf_width: float) -> str:
+    return _WARN_SHELF_SAG.format(width=shelf_width, max_span=DEFAULT_MAX_SHELF_SPAN_MM)
+
+
+def _copy_holes(layout: Iterable[dict]) -> list[dict]:
+    """Свежие dict из раскладки: вызывающий волен их менять, оригинал не заденет."""
+    return [dict(hole) for hole in layout]
+
+
 def _convert_fasteners(holes: list[dict], standards: dict[str, Any] | None) -> list[dict]:
     settings = _merge_standards(standards)
     if settings["fastener_type"] != "dowel":
@@ -110,11 +165,11 @@ def _convert_fasteners(holes: list[dict], standards: dict[str, Any] | None) -> l
             **hole,
             "diameter": 8.0,
             "depth": 24.0,
-            "hardware_type": "dowel",
+            "hardware_type": HW_DOWEL,
         }
         for hole in holes
-        if hole.get("hardware_type") == "confirmat"
-    ] + [hole for hole in holes if hole.get("hardware_type") != "confirmat"]
+        if hole.get("hardware_type") == HW_CONFIRMAT
+    ] + [hole for hole in holes if hole.get("hardware_type") != HW_CONFIRMAT]
 
 def _generate_bottom_mount_side_holes(
     panel_width: float,
@@ -122,10 +177,10 @@ def _generate_bottom_mount_side_holes(
     standards: dict[str, Any],
 ) -> list[dict]:
     """Отверстия в нижнем торце боковины для дна на боковинах."""
-    holes = []
-    for x in (CONFIRMAT_FRONT_OFFSET_MM, panel_width - CONFIRMAT_FRONT_OFFSET_MM):
-        holes.append(_fastener_hole(x, 0, "edge", standards))
-    return holes
+    return [
+        _fastener_hole(x, 0, SIDE_EDGE, standards["fastener_type"])
+        for x in (CONFIRMAT_FRONT_OFFSET_MM, panel_width - CONFIRMAT_FRONT_OFFSET_MM)
+    ]
 
 
 def _generate_bottom_face_holes(
@@ -140,11 +195,12 @@ def _generate_bottom_face_holes(
     сверлится именно дно, по два отверстия под каждую боковину, а ответные
     отверстия в торцах боковин делает `_generate_bottom_mount_side_holes`.
     """
-    holes = []
-    for x in (thickness / 2, panel_width - thickness / 2):
-        for y in (CONFIRMAT_FRONT_OFFSET_MM, panel_depth - CONFIRMAT_FRONT_OFFSET_MM):
-            holes.append(_fastener_hole(x, y, "face", standards))
-    return holes
+    fastener_type = standards["fastener_type"]
+    return [
+        _fastener_hole(x, y, SIDE_FACE, fastener_type)
+        for x in (thickness / 2, panel_width - thickness / 2)
+        for y in (CONFIRMAT_FRONT_OFFSET_MM, panel_depth - CONFIRMAT_FRONT_OFFSET_MM)
+    ]
 
 def _generate_confirmat_holes_for_horizontal(
     panel_width: float,
@@ -154,6 +210,17 @@ def _generate_confirmat_holes_for_horizontal(
 ) -> list[dict]:
     """Генерирует крепёжные отверстия в торцах горизонтальной панели."""
     settings = _merge_standards(standards)
+    return _copy_holes(_horizontal_hole_layout(
+        panel_width, panel_height, settings["fastener_type"],
+    ))
+
+
+@lru_cache(maxsize=512)
+def _horizontal_hole_layout(
+    panel_width: float,
+    panel_height: float,
+    fastener_type: str,
+) -> tuple[dict, ...]:
     front_offset = CONFIRMAT_FRONT_OFFSET_MM
     usable_depth = panel_height - 2 * front_offset
     y_positions = (
@@ -161,11 +228,11 @@ def _generate_confirmat_holes_for_horizontal(
         if usable_depth > CONFIRMAT_SPACING_MM
         else [panel_height / 2]
     )
-    holes = []
-    for x in (0, panel_width):
-        for y in y_positions:
-            holes.append(_fastener_hole(x, y, "edge", settings))
-    return holes
+    return tuple(
+        _fastener_hole(x, y, SIDE_EDGE, fastener_type)
+        for x in (0, panel_width)
+        for y in y_positions
+    )
 
 def _generate_fixed_shelf_holes(
     panel_width: float,
@@ -184,14 +251,7 @@ def _generate_fixed_shelf_holes(
     ]
     x_positions = [CONFIRMAT_FRONT_OFFSET_MM, panel_width - CONFIRMAT_FRONT_OFFSET_MM]
     holes = [
-        {
-            "x": x,
-            "y": y,
-            "diameter": CONFIRMAT_DIAMETER_MM,
-            "depth": CONFIRMAT_DEPTH_FACE_MM,
-            "side": "face",
-            "hardware_type": "confirmat",
-        }
+        {"x": x, "y": y, **_CONFIRMAT_FACE_HOLE}
         for y in y_positions
         for x in x_positions
     ]
@@ -212,8 +272,6 @@ def _generate_confirmat_holes_for_tie_beams_on_side(
     планки; на узкой планке, куда два винта не встают, остаётся один по центру.
     Планка 70 мм — рабочий минимум для пары: отступ 20 мм от каждого края.
     """
-    holes: list[dict] = []
-
     edge_offset = 20.0
     if beam_height >= 2 * edge_offset + 20.0:
         y_positions = [
@@ -226,17 +284,11 @@ def _generate_confirmat_holes_for_tie_beams_on_side(
     # Передняя царга прижата к переднему краю, задняя — к заднему.
     x_positions = [thickness / 2, panel_width - thickness / 2]
 
-    for x in x_positions:
-        for y in y_positions:
-            holes.append({
-                "x": x,
-                "y": y,
-                "diameter": CONFIRMAT_DIAMETER_MM,
-                "depth": CONFIRMAT_DEPTH_FACE_MM,
-                "side": "face",
-                "hardware_type": "confirmat",
-            })
-
+    holes = [
+        {"x": x, "y": y, **_CONFIRMAT_FACE_HOLE}
+        for x in x_positions
+        for y in y_positions
+    ]
     return _convert_fasteners(holes, standards)
 
 
@@ -252,8 +304,20 @@ def _generate_confirmat_holes_for_side(
     Генерирует отверстия под конфирматы для боковины.
     Конфирматы идут в пласть панели сверху и снизу.
     """
-    holes = []
+    holes = _copy_holes(_side_hole_layout(
+        panel_width, panel_height, thickness, top_panel, bottom_panel,
+    ))
+    return _convert_fasteners(holes, standards)
 
+
+@lru_cache(maxsize=512)
+def _side_hole_layout(
+    panel_width: float,
+    panel_height: float,
+    thickness: float,
+    top_panel: bool,
+    bottom_panel: bool,
+) -> tuple[dict, ...]:
     # Отступ от переднего и заднего края
     front_offset = CONFIRMAT_FRONT_OFFSET_MM
     back_offset = CONFIRMAT_FRONT_OFFSET_MM
@@ -265,33 +329,18 @@ def _generate_confirmat_holes_for_side(
     else:
         x_positions = [panel_width / 2]
 
-    # Верхние отверстия (под верхнюю панель)
+    # Ряды по высоте: центр верхней и центр нижней панели
+    y_positions = []
     if top_panel:
-        y_top = panel_height - thickness / 2  # Центр верхней панели
-        for x in x_positions:
-            holes.append({
-                "x": x,
-                "y": y_top,
-                "diameter": CONFIRMAT_DIAMETER_MM,
-                "depth": CONFIRMAT_DEPTH_FACE_MM,
-                "side": "face",
-                "hardware_type": "confirmat",
-            })
-
-    # Нижние отверстия (под нижнюю панель)
+        y_positions.append(panel_height - thickness / 2)
     if bottom_panel:
-        y_bottom = thickness / 2  # Центр нижней панели
-        for x in x_positions:
-            holes.append({
-                "x": x,
-                "y": y_bottom,
-                "diameter": CONFIRMAT_DIAMETER_MM,
-                "depth": CONFIRMAT_DEPTH_FACE_MM,
-                "side": "face",
-                "hardware_type": "confirmat",
-            })
+        y_positions.append(thickness / 2)
 
-    return _convert_fasteners(holes, standards)
+    return tuple(
+        {"x": x, "y": y, **_CONFIRMAT_FACE_HOLE}
+        for y in y_positions
+        for x in x_positions
+    )
 
 
 def _generate_shelf_pin_holes(
@@ -307,41 +356,36 @@ def _generate_shelf_pin_holes(
     """
     if shelf_count == 0:
         return []
+    return _copy_holes(_shelf_pin_layout(
+        panel_width, panel_height, thickness, bottom_offset, top_offset,
+    ))
 
-    holes = []
 
+@lru_cache(maxsize=512)
+def _shelf_pin_layout(
+    panel_width: float,
+    panel_height: float,
+    thickness: float,
+    bottom_offset: float,
+    top_offset: float,
+) -> tuple[dict, ...]:
     # Позиция по X (глубина) — отступ от переднего края
-    x_front = SYSTEM32_FRONT_OFFSET_MM
-    x_back = panel_width - SYSTEM32_FRONT_OFFSET_MM
+    x_positions = (SYSTEM32_FRONT_OFFSET_MM, panel_width - SYSTEM32_FRONT_OFFSET_MM)
 
     # Диапазон по Y (высота) — где могут быть полки
     y_start = bottom_offset + thickness
     y_end = panel_height - top_offset - thickness
 
-    # Генерируем отверстия с шагом 32мм
-    y = y_start
-    while y <= y_end:
-        # Передний ряд
-        holes.append({
-            "x": x_front,
-            "y": y,
-            "diameter": SYSTEM32_DIAMETER_MM,
-            "depth": SYSTEM32_DEPTH_MM,
-            "side": "face",
-            "hardware_type": "shelf_pin",
-        })
-        # Задний ряд
-        holes.append({
-            "x": x_back,
-            "y": y,
-            "diameter": SYSTEM32_DIAMETER_MM,
-            "depth": SYSTEM32_DEPTH_MM,
-            "side": "face",
-            "hardware_type": "shelf_pin",
-        })
-        y += SYSTEM32_STEP_MM
+    # Шаг 32мм: координаты считаются от начала ряда, без накопления ошибки
+    step_count = int((y_end - y_start) // SYSTEM32_STEP_MM) + 1
+    y_positions = [y_start + SYSTEM32_STEP_MM * index for index in range(step_count)]
 
-    return holes
+    # Передний и задний ряд на каждой высоте
+    return tuple(
+        {"x": x, "y": y, **_SHELF_PIN_HOLE}
+        for y in y_positions
+        for x in x_positions
+    )
 
 
 def _generate_hinge_cup_holes(panel_height: float, hinge_count: int) -> list[dict]:
@@ -366,8 +410,8 @@ def _generate_hinge_cup_holes(panel_height: float, hinge_count: int) -> list[dic
             "y": y,
             "diameter": HINGE_CUP_DIAMETER_MM,
             "depth": HINGE_CUP_DEPTH_MM,
-            "side": "face",
-            "hardware_type": "hinge_cup",
+            "side": SIDE_FACE,
+            "hardware_type": HW_HINGE_CUP,
         }
         for y in y_positions
     ]
@@ -383,8 +427,8 @@ def _generate_hinge_mount_holes(cup_holes: list[dict]) -> list[dict]:
                 "y": cup["y"],
                 "diameter": 5.0,
                 "depth": 12.0,
-                "side": "face",
-                "hardware_type": "hinge_mount",
+                "side": SIDE_FACE,
+                "hardware_type": HW_HINGE_MOUNT,
             })
     return holes
 def _facade_panels(
@@ -441,7 +485,133 @@ def _append_facades(
     ))
 
 
-@dataclass
+def _side_panels(
+    depth_mm: float,
+    height_mm: float,
+    thickness_mm: float,
+    drilling: list[dict],
+    notes: str = "",
+) -> tuple[PanelSpec, PanelSpec]:
+    """Левая и правая боковины корпуса: размеры общие, присадка у каждой своя."""
+    common = {
+        "width_mm": depth_mm,
+        "height_mm": height_mm,
+        "thickness_mm": thickness_mm,
+        "edge_front": True,  # Видимая кромка спереди
+        "edge_thickness_mm": DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
+        "has_slot_for_back": True,
+        "notes": notes,
+    }
+    return (
+        PanelSpec(name="Боковина левая", drilling_points=drilling, **common),
+        PanelSpec(name="Боковина правая", drilling_points=_copy_holes(drilling), **common),
+    )
+
+
+
+def _top_bottom_panels(
+    width_mm: float,
+    depth_mm: float,
+    thickness_mm: float,
+    drilling: list[dict],
+) -> tuple[PanelSpec, PanelSpec]:
+    """Верх и низ между боковинами: присадка в торцы, у каждой панели своя."""
+    return (
+        PanelSpec(
+            name="Верх", width_mm=width_mm, height_mm=depth_mm, thickness_mm=thickness_mm,
+            has_slot_for_back=True, drilling_points=_copy_holes(drilling),
+        ),
+        PanelSpec(
+            name="Низ", width_mm=width_mm, height_mm=depth_mm, thickness_mm=thickness_mm,
+            has_slot_for_back=True, drilling_points=_copy_holes(drilling),
+        ),
+    )
+
+
+def _tie_beam_panels(
+    width_mm: float,
+    height_mm: float,
+    thickness_mm: float,
+    drilling: list[dict],
+) -> tuple[PanelSpec, PanelSpec]:
+    """Передняя и задняя царги вместо сплошного верха, у каждой своя присадка."""
+    return (
+        PanelSpec(
+            name="Царга передняя", width_mm=width_mm, height_mm=height_mm,
+            thickness_mm=thickness_mm, drilling_points=_copy_holes(drilling),
+        ),
+        PanelSpec(
+            name="Царга задняя", width_mm=width_mm, height_mm=height_mm,
+            thickness_mm=thickness_mm, drilling_points=_copy_holes(drilling),
+        ),
+    )
+
+
+def _fixed_shelf_panel(
+    width_mm: float,
+    depth_mm: float,
+    thickness_mm: float,
+    quantity: int,
+    drilling: list[dict],
+) -> PanelSpec:
+    """Конструкционная полка в распор: кромка спереди, конфирматы в торцы."""
+    return PanelSpec(
+        name="Полка конструкционная",
+        width_mm=width_mm,
+        height_mm=depth_mm,
+        thickness_mm=thickness_mm,
+        quantity=quantity,
+        edge_front=True,
+        edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
+        notes=_NOTE_FIXED_SHELF,
+        drilling_points=_copy_holes(drilling),
+    )
+
+
+def _removable_shelf_panel(
+    width_mm: float,
+    depth_mm: float,
+    thickness_mm: float,
+    quantity: int,
+    notes: str = "",
+) -> PanelSpec:
+    """Съёмная полка на полкодержателях: кромка по периметру, без присадки."""
+    return PanelSpec(
+        name="Полка",
+        width_mm=width_mm,
+        height_mm=depth_mm,
+        thickness_mm=thickness_mm,
+        quantity=quantity,
+        edge_front=True,
+        edge_back=True,
+        edge_top=True,
+        edge_bottom=True,
+        edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
+        notes=notes,
+    )
+
+
+# Поля PanelSpec.to_dict в порядке ответа API; значения снимаются одним attrgetter
+_PANEL_DICT_FIELDS = (
+    "name",
+    "width_mm",
+    "height_mm",
+    "thickness_mm",
+    "quantity",
+    "edge_front",
+    "edge_back",
+    "edge_top",
+    "edge_bottom",
+    "edge_thickness_mm",
+    "has_slot_for_back",
+    "notes",
+    "drilling_points",
+)
+_panel_dict_values = operator.attrgetter(*_PANEL_DICT_FIELDS)
+_panel_quantity = operator.attrgetter("quantity")
+
+
+@dataclass(slots=True)
 class PanelSpec:
     """Спецификация панели."""
     name: str
@@ -483,24 +653,10 @@ class PanelSpec:
 
     def to_dict(self) -> dict[str, Any]:
         """Конвертация в словарь для API."""
-        return {
-            "name": self.name,
-            "width_mm": self.width_mm,
-            "height_mm": self.height_mm,
-            "thickness_mm": self.thickness_mm,
-            "quantity": self.quantity,
-            "edge_front": self.edge_front,
-            "edge_back": self.edge_back,
-            "edge_top": self.edge_top,
-            "edge_bottom": self.edge_bottom,
-            "edge_thickness_mm": self.edge_thickness_mm,
-            "has_slot_for_back": self.has_slot_for_back,
-            "notes": self.notes,
-            "drilling_points": self.drilling_points,
-        }
+        return dict(zip(_PANEL_DICT_FIELDS, _panel_dict_values(self), strict=True))
 
 
-@dataclass
+@dataclass(slots=True)
 class CalculationResult:
     """Результат расчёта панелей."""
     cabinet_type: str
@@ -513,15 +669,16 @@ class CalculationResult:
 
     @property
     def total_panels(self) -> int:
-        return sum(p.quantity for p in self.panels)
+        return sum(map(_panel_quantity, self.panels))
 
     @property
     def total_area_m2(self) -> float:
-        return sum(p.area_m2 for p in self.panels)
+        # Площадь в мм2 по всем панелям, перевод в м2 один раз в конце
+        return math.fsum(p.width_mm * p.height_mm * p.quantity for p in self.panels) / 1_000_000
 
     @property
     def edge_length_m(self) -> float:
-        return sum(p.edge_length_mm for p in self.panels) / 1000
+        return math.fsum(p.edge_length_mm for p in self.panels) / 1000
 
 
 # ============================================================================
@@ -550,21 +707,11 @@ class CabinetTemplate:
         self.include_facades = include_facades
         self.facade_color = facade_color
         self.standards = _merge_standards(standards)
- 
-    @property
-    def inner_width(self) -> float:
-        """Внутренняя ширина (между боковинами)."""
-        return self.width_mm - 2 * self.thickness_mm
 
-    @property
-    def inner_height(self) -> float:
-        """Внутренняя высота."""
-        return self.height_mm - 2 * self.thickness_mm
-
-    @property
-    def inner_depth(self) -> float:
-        """Внутренняя глубина (минус задняя стенка)."""
-        return self.depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM
+        # Производная геометрия корпуса: размеры после __init__ не меняются
+        self.inner_width = width_mm - 2 * thickness_mm  # Между боковинами
+        self.inner_height = height_mm - 2 * thickness_mm
+        self.inner_depth = depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM  # Минус паз под заднюю стенку
 
     def calculate(
         self,
@@ -593,11 +740,12 @@ class WallCabinetTemplate(CabinetTemplate):
             height_mm=self.height_mm,
             depth_mm=self.depth_mm,
         )
+        panels = result.panels
 
         # Боковины (2 шт)
         # Высота = полная высота корпуса
         # Глубина = глубина корпуса - паз под заднюю стенку
-        side_depth = self.depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM
+        side_depth = self.inner_depth
 
         # Присадка для боковин: конфирматы под верх/низ + полкодержатели
         side_drilling = _generate_confirmat_holes_for_side(
@@ -621,28 +769,9 @@ class WallCabinetTemplate(CabinetTemplate):
             fixed_shelf_count=fixed_shelf_count,
         ))
 
-        result.panels.append(PanelSpec(
-            name="Боковина левая",
-            width_mm=side_depth,
-            height_mm=self.height_mm,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,  # Видимая кромка спереди
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            notes="Паз под ДВП 4x10мм",
-            drilling_points=list(side_drilling),  # independent copy (Task 6)
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Боковина правая",
-            width_mm=side_depth,
-            height_mm=self.height_mm,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            notes="Паз под ДВП 4x10мм",
-            drilling_points=list(side_drilling),  # independent copy, not shared mutable (Task 6)
+        panels.extend(_side_panels(
+            side_depth, self.height_mm, self.thickness_mm, side_drilling,
+            notes=_NOTE_BACK_SLOT,
         ))
 
         # Верх и низ
@@ -657,63 +786,30 @@ class WallCabinetTemplate(CabinetTemplate):
             thickness=self.thickness_mm,
         )
 
-        result.panels.append(PanelSpec(
-            name="Верх",
-            width_mm=horizontal_width,
-            height_mm=horizontal_depth,
-            thickness_mm=self.thickness_mm,
-            has_slot_for_back=True,
-            drilling_points=list(horizontal_drilling),
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Низ",
-            width_mm=horizontal_width,
-            height_mm=horizontal_depth,
-            thickness_mm=self.thickness_mm,
-            has_slot_for_back=True,
-            drilling_points=list(horizontal_drilling),
+        panels.extend(_top_bottom_panels(
+            horizontal_width, horizontal_depth, self.thickness_mm, horizontal_drilling,
         ))
 
         if fixed_shelf_count > 0:
-            result.panels.append(PanelSpec(
-                name="Полка конструкционная",
-                width_mm=horizontal_width,
-                height_mm=horizontal_depth,
-                thickness_mm=self.thickness_mm,
-                quantity=fixed_shelf_count,
-                edge_front=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-                notes="Конструкционная полка в распор",
-                drilling_points=list(horizontal_drilling),
+            panels.append(_fixed_shelf_panel(
+                horizontal_width, horizontal_depth, self.thickness_mm,
+                fixed_shelf_count, horizontal_drilling,
             ))
 
         # Полки (съёмные)
         if shelf_count > 0:
             # Ширина полки = внутренняя ширина - 2 x зазор
-            shelf_width = horizontal_width - 2 * DEFAULT_SHELF_GAP_MM
+            shelf_width = horizontal_width - _SHELF_WIDTH_GAP_MM
             shelf_depth = horizontal_depth - DEFAULT_SHELF_GAP_MM  # Зазор сзади
 
-            result.panels.append(PanelSpec(
-                name="Полка",
-                width_mm=shelf_width,
-                height_mm=shelf_depth,
-                thickness_mm=self.thickness_mm,
-                quantity=shelf_count,
-                edge_front=True,
-                edge_back=True,
-                edge_top=True,
-                edge_bottom=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-                notes="Съёмная полка на полкодержателях",
+            panels.append(_removable_shelf_panel(
+                shelf_width, shelf_depth, self.thickness_mm, shelf_count,
+                notes=_NOTE_REMOVABLE_SHELF,
             ))
 
             # Проверка провиса
             if shelf_width > DEFAULT_MAX_SHELF_SPAN_MM:
-                result.warnings.append(
-                    f"Полка {shelf_width:.0f}мм может провиснуть (макс {DEFAULT_MAX_SHELF_SPAN_MM:.0f}мм). "
-                    "Рекомендуется вертикальная перегородка."
-                )
+                result.warnings.append(_shelf_sag_warning(shelf_width))
 
         # Фасады: у навесного шкафа они накладные, петли сверлятся в них.
         _append_facades(
@@ -735,7 +831,8 @@ class BaseCabinetTemplate(CabinetTemplate):
         drawer_count: int = 0,
     ) -> CalculationResult:
         result = CalculationResult("base", self.width_mm, self.height_mm, self.depth_mm)
-        side_depth = self.depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM
+        panels = result.panels
+        side_depth = self.inner_depth
         on_bottom = self.standards["bottom_mount"] == "on_bottom"
         side_height = self.height_mm - self.thickness_mm if on_bottom else self.height_mm
         side_drilling = _generate_confirmat_holes_for_side(
@@ -753,13 +850,9 @@ class BaseCabinetTemplate(CabinetTemplate):
         side_drilling.extend(_generate_fixed_shelf_holes(
             side_depth, side_height, self.thickness_mm, fixed_shelf_count, self.standards,
         ))
-        for name in ("Боковина левая", "Боковина правая"):
-            result.panels.append(PanelSpec(
-                name=name, width_mm=side_depth, height_mm=side_height,
-                thickness_mm=self.thickness_mm, edge_front=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-                has_slot_for_back=True, drilling_points=list(side_drilling),
-            ))
+        panels.extend(_side_panels(
+            side_depth, side_height, self.thickness_mm, side_drilling,
+        ))
         horizontal_width = self.width_mm if on_bottom else self.inner_width
         bottom_drilling = (
             _generate_bottom_face_holes(
@@ -770,7 +863,7 @@ class BaseCabinetTemplate(CabinetTemplate):
                 horizontal_width, side_depth, self.thickness_mm, self.standards,
             )
         )
-        result.panels.append(PanelSpec(
+        panels.append(PanelSpec(
             name="Дно", width_mm=horizontal_width, height_mm=side_depth,
             thickness_mm=self.thickness_mm, has_slot_for_back=True,
             drilling_points=bottom_drilling,
@@ -779,33 +872,21 @@ class BaseCabinetTemplate(CabinetTemplate):
         tie_drilling = _generate_confirmat_holes_for_horizontal(
             self.inner_width, tie_height, self.thickness_mm, self.standards,
         )
-        for name in ("Царга передняя", "Царга задняя"):
-            result.panels.append(PanelSpec(
-                name=name, width_mm=self.inner_width, height_mm=tie_height,
-                thickness_mm=self.thickness_mm, drilling_points=list(tie_drilling),
-            ))
+        panels.extend(_tie_beam_panels(
+            self.inner_width, tie_height, self.thickness_mm, tie_drilling,
+        ))
         if fixed_shelf_count > 0:
             fixed_drilling = _generate_confirmat_holes_for_horizontal(
                 self.inner_width, side_depth, self.thickness_mm, self.standards,
             )
-            result.panels.append(PanelSpec(
-                name="Полка конструкционная",
-                width_mm=self.inner_width,
-                height_mm=side_depth,
-                thickness_mm=self.thickness_mm,
-                quantity=fixed_shelf_count,
-                edge_front=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-                notes="Конструкционная полка в распор",
-                drilling_points=fixed_drilling,
+            panels.append(_fixed_shelf_panel(
+                self.inner_width, side_depth, self.thickness_mm, fixed_shelf_count, fixed_drilling,
             ))
         if shelf_count > 0:
             shelf_gap = self.standards["shelf_gap_mm"]
-            result.panels.append(PanelSpec(
-                name="Полка", width_mm=self.inner_width - 2 * shelf_gap,
-                height_mm=side_depth - shelf_gap, thickness_mm=self.thickness_mm,
-                quantity=shelf_count, edge_front=True, edge_back=True, edge_top=True, edge_bottom=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
+            panels.append(_removable_shelf_panel(
+                self.inner_width - 2 * shelf_gap, side_depth - shelf_gap,
+                self.thickness_mm, shelf_count,
             ))
         _append_facades(
             result, self.width_mm, self.height_mm, self.thickness_mm, door_count,
@@ -834,87 +915,45 @@ class BaseSinkCabinetTemplate(CabinetTemplate):
             height_mm=self.height_mm,
             depth_mm=self.depth_mm,
         )
+        panels = result.panels
 
-        side_depth = self.depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM
+        side_depth = self.inner_depth
 
         # Присадка для боковин: только конфирматы под связи (нет дна и верха)
         # Минимальная присадка - конфирматы под верхние и нижние связи
-        side_drilling: list[dict] = []
-        # Верхние связи
-        for x in [CONFIRMAT_FRONT_OFFSET_MM, side_depth - CONFIRMAT_FRONT_OFFSET_MM]:
-            side_drilling.append({
-                "x": x,
-                "y": self.height_mm - self.thickness_mm / 2,
-                "diameter": CONFIRMAT_DIAMETER_MM,
-                "depth": CONFIRMAT_DEPTH_FACE_MM,
-                "side": "face",
-                "hardware_type": "confirmat",
-            })
-        # Нижние связи
-        for x in [CONFIRMAT_FRONT_OFFSET_MM, side_depth - CONFIRMAT_FRONT_OFFSET_MM]:
-            side_drilling.append({
-                "x": x,
-                "y": self.thickness_mm / 2,
-                "diameter": CONFIRMAT_DIAMETER_MM,
-                "depth": CONFIRMAT_DEPTH_FACE_MM,
-                "side": "face",
-                "hardware_type": "confirmat",
-            })
+        x_positions = (CONFIRMAT_FRONT_OFFSET_MM, side_depth - CONFIRMAT_FRONT_OFFSET_MM)
+        # Верхние связи, затем нижние
+        y_positions = (self.height_mm - self.thickness_mm / 2, self.thickness_mm / 2)
+        side_drilling = [
+            {"x": x, "y": y, **_CONFIRMAT_FACE_HOLE}
+            for y in y_positions
+            for x in x_positions
+        ]
 
         # Боковины
-        result.panels.append(PanelSpec(
-            name="Боковина левая",
-            width_mm=side_depth,
-            height_mm=self.height_mm,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            drilling_points=list(side_drilling),
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Боковина правая",
-            width_mm=side_depth,
-            height_mm=self.height_mm,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            drilling_points=list(side_drilling),
+        panels.extend(_side_panels(
+            side_depth, self.height_mm, self.thickness_mm, side_drilling,
         ))
 
         horizontal_width = self.inner_width
 
-        # Только связи (царги), без дна
-        result.panels.append(PanelSpec(
-            name="Связь верхняя передняя",
-            width_mm=horizontal_width,
-            height_mm=self.standards["tie_beam_height_mm"],
-            thickness_mm=self.thickness_mm,
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Связь верхняя задняя",
-            width_mm=horizontal_width,
-            height_mm=self.standards["tie_beam_height_mm"],
-            thickness_mm=self.thickness_mm,
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Связь нижняя передняя",
-            width_mm=horizontal_width,
-            height_mm=self.standards["tie_beam_height_mm"],
-            thickness_mm=self.thickness_mm,
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Связь нижняя задняя",
-            width_mm=horizontal_width,
-            height_mm=self.standards["tie_beam_height_mm"],
-            thickness_mm=self.thickness_mm,
-        ))
-
+        # Только связи (царги), без дна. Каждая связь — отдельная деталь
+        # со своим местом в корпусе, поэтому не сворачиваем в quantity=4.
+        tie_height = self.standards["tie_beam_height_mm"]
+        panels.extend(
+            PanelSpec(
+                name=name,
+                width_mm=horizontal_width,
+                height_mm=tie_height,
+                thickness_mm=self.thickness_mm,
+            )
+            for name in (
+                "Связь верхняя передняя",
+                "Связь верхняя задняя",
+                "Связь нижняя передняя",
+                "Связь нижняя задняя",
+            )
+        )
 
         # Фасады тумбы под мойку.
         _append_facades(
@@ -945,8 +984,9 @@ class DrawerCabinetTemplate(CabinetTemplate):
             height_mm=self.height_mm,
             depth_mm=self.depth_mm,
         )
+        panels = result.panels
 
-        side_depth = self.depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM
+        side_depth = self.inner_depth
         on_bottom = self.standards["bottom_mount"] == "on_bottom"
         side_height = self.height_mm - self.thickness_mm if on_bottom else self.height_mm
 
@@ -973,26 +1013,8 @@ class DrawerCabinetTemplate(CabinetTemplate):
         ))
 
         # Боковины
-        result.panels.append(PanelSpec(
-            name="Боковина левая",
-            width_mm=side_depth,
-            height_mm=side_height,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            drilling_points=list(side_drilling),
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Боковина правая",
-            width_mm=side_depth,
-            height_mm=side_height,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            drilling_points=list(side_drilling),
+        panels.extend(_side_panels(
+            side_depth, side_height, self.thickness_mm, side_drilling,
         ))
 
         horizontal_width = self.width_mm if on_bottom else self.inner_width
@@ -1014,7 +1036,7 @@ class DrawerCabinetTemplate(CabinetTemplate):
         )
 
         # Дно корпуса
-        result.panels.append(PanelSpec(
+        panels.append(PanelSpec(
             name="Дно",
             width_mm=horizontal_width,
             height_mm=horizontal_depth,
@@ -1031,20 +1053,9 @@ class DrawerCabinetTemplate(CabinetTemplate):
             standards=self.standards,
         )
 
-        result.panels.append(PanelSpec(
-            name="Царга передняя",
-            width_mm=horizontal_width,
-            height_mm=self.standards["tie_beam_height_mm"],
-            thickness_mm=self.thickness_mm,
-            drilling_points=list(tie_beam_drilling),
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Царга задняя",
-            width_mm=horizontal_width,
-            height_mm=self.standards["tie_beam_height_mm"],
-            thickness_mm=self.thickness_mm,
-            drilling_points=list(tie_beam_drilling),
+        panels.extend(_tie_beam_panels(
+            horizontal_width, self.standards["tie_beam_height_mm"], self.thickness_mm,
+            tie_beam_drilling,
         ))
 
         # Ящики
@@ -1053,53 +1064,50 @@ class DrawerCabinetTemplate(CabinetTemplate):
         drawer_inner_width = drawer_outer_width - 2 * self.thickness_mm
 
         # Высота ящика: равномерно делим внутреннюю высоту
-        drawer_front_height = (self.height_mm - 2 * self.thickness_mm) / drawer_count - 4  # 4мм зазор между фасадами
+        drawer_front_height = self.inner_height / drawer_count - 4  # 4мм зазор между фасадами
 
         # Глубина боковины ящика
         drawer_depth = horizontal_depth - 50  # Минус 50мм на зазор сзади
 
-        for i in range(drawer_count):
-            num = i + 1
-
-            # Фасад ящика
-            result.panels.append(PanelSpec(
-                name=f"Фасад ящика {num}",
-                width_mm=self.width_mm - 4,  # Зазоры по бокам
-                height_mm=drawer_front_height,
-                thickness_mm=self.thickness_mm,
-                edge_front=True,
-                edge_back=True,
-                edge_top=True,
-                edge_bottom=True,
-                edge_thickness_mm=DEFAULT_FACADE_EDGE_THICKNESS_MM,
-            ))
-
+        # У всех ящиков одни и те же детали, отличается только номер в имени
+        drawer_box_height = drawer_front_height - 30  # Ниже фасада
+        drawer_parts = (
+            ("Фасад ящика {}", {
+                "width_mm": self.width_mm - 4,  # Зазоры по бокам
+                "height_mm": drawer_front_height,
+                "thickness_mm": self.thickness_mm,
+                "edge_front": True,
+                "edge_back": True,
+                "edge_top": True,
+                "edge_bottom": True,
+                "edge_thickness_mm": DEFAULT_FACADE_EDGE_THICKNESS_MM,
+            }),
             # Боковины ящика (2 шт)
-            result.panels.append(PanelSpec(
-                name=f"Боковина ящика {num}",
-                width_mm=drawer_depth,
-                height_mm=drawer_front_height - 30,  # Ниже фасада
-                thickness_mm=self.thickness_mm,
-                quantity=2,
-            ))
-
+            ("Боковина ящика {}", {
+                "width_mm": drawer_depth,
+                "height_mm": drawer_box_height,
+                "thickness_mm": self.thickness_mm,
+                "quantity": 2,
+            }),
             # Передняя и задняя стенки ящика (2 шт)
-            result.panels.append(PanelSpec(
-                name=f"Стенка ящика {num}",
-                width_mm=drawer_inner_width,
-                height_mm=drawer_front_height - 30,
-                thickness_mm=self.thickness_mm,
-                quantity=2,
-            ))
-
-            # Дно ящика (ДВП)
-            result.panels.append(PanelSpec(
-                name=f"Дно ящика {num} (ДВП)",
-                width_mm=drawer_outer_width - 10,
-                height_mm=drawer_front_height - 30,
-                thickness_mm=3.0,
-                notes="ДВП 3мм",
-            ))
+            ("Стенка ящика {}", {
+                "width_mm": drawer_inner_width,
+                "height_mm": drawer_box_height,
+                "thickness_mm": self.thickness_mm,
+                "quantity": 2,
+            }),
+            ("Дно ящика {} (ДВП)", {
+                "width_mm": drawer_outer_width - 10,
+                "height_mm": drawer_box_height,
+                "thickness_mm": 3.0,
+                "notes": _NOTE_DRAWER_BOTTOM,
+            }),
+        )
+        panels.extend(
+            PanelSpec(name=name.format(num), **part)
+            for num in range(1, drawer_count + 1)
+            for name, part in drawer_parts
+        )
 
         return result
 
@@ -1120,8 +1128,9 @@ class TallCabinetTemplate(CabinetTemplate):
             height_mm=self.height_mm,
             depth_mm=self.depth_mm,
         )
+        panels = result.panels
 
-        side_depth = self.depth_mm - DEFAULT_BACK_SLOT_DEPTH_MM
+        side_depth = self.inner_depth
 
         # Присадка для боковин пенала: конфирматы + полкодержатели
         side_drilling = _generate_confirmat_holes_for_side(
@@ -1146,28 +1155,8 @@ class TallCabinetTemplate(CabinetTemplate):
         ))
         
         # Боковины
-
-        # Боковины
-        result.panels.append(PanelSpec(
-            name="Боковина левая",
-            width_mm=side_depth,
-            height_mm=self.height_mm,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            drilling_points=list(side_drilling),
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Боковина правая",
-            width_mm=side_depth,
-            height_mm=self.height_mm,
-            thickness_mm=self.thickness_mm,
-            edge_front=True,
-            edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-            has_slot_for_back=True,
-            drilling_points=list(side_drilling),
+        panels.extend(_side_panels(
+            side_depth, self.height_mm, self.thickness_mm, side_drilling,
         ))
 
         horizontal_width = self.inner_width
@@ -1181,57 +1170,27 @@ class TallCabinetTemplate(CabinetTemplate):
         )
 
         # Верх и низ
-        result.panels.append(PanelSpec(
-            name="Верх",
-            width_mm=horizontal_width,
-            height_mm=horizontal_depth,
-            thickness_mm=self.thickness_mm,
-            has_slot_for_back=True,
-            drilling_points=list(horizontal_drilling),
-        ))
-
-        result.panels.append(PanelSpec(
-            name="Низ",
-            width_mm=horizontal_width,
-            height_mm=horizontal_depth,
-            thickness_mm=self.thickness_mm,
-            has_slot_for_back=True,
-            drilling_points=list(horizontal_drilling),
+        panels.extend(_top_bottom_panels(
+            horizontal_width, horizontal_depth, self.thickness_mm, horizontal_drilling,
         ))
 
         # Полки
         if shelf_count > 0:
-            shelf_width = horizontal_width - 2 * DEFAULT_SHELF_GAP_MM
+            shelf_width = horizontal_width - _SHELF_WIDTH_GAP_MM
             shelf_depth = horizontal_depth - DEFAULT_SHELF_GAP_MM
 
         if fixed_shelf_count > 0:
-            result.panels.append(PanelSpec(
-                name="Полка конструкционная",
-                width_mm=horizontal_width,
-                height_mm=horizontal_depth,
-                thickness_mm=self.thickness_mm,
-                quantity=fixed_shelf_count,
-                edge_front=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
-                notes="Конструкционная полка в распор",
-                drilling_points=list(horizontal_drilling),
+            panels.append(_fixed_shelf_panel(
+                horizontal_width, horizontal_depth, self.thickness_mm,
+                fixed_shelf_count, horizontal_drilling,
             ))
 
-            result.panels.append(PanelSpec(
-                name="Полка",
-                width_mm=shelf_width,
-                height_mm=shelf_depth,
-                thickness_mm=self.thickness_mm,
-                quantity=shelf_count,
-                edge_front=True,
-                edge_back=True,
-                edge_top=True,
-                edge_bottom=True,
-                edge_thickness_mm=DEFAULT_VISIBLE_EDGE_THICKNESS_MM,
+            panels.append(_removable_shelf_panel(
+                shelf_width, shelf_depth, self.thickness_mm, shelf_count,
             ))
 
             if shelf_width > DEFAULT_MAX_SHELF_SPAN_MM:
-                result.warnings.append(f"Полка {shelf_width:.0f}мм может провиснуть")
+                result.warnings.append(_shelf_sag_warning(shelf_width))
 
         # Для высоких шкафов рекомендуем крепление к стене
         if self.height_mm > 2000:
@@ -1258,26 +1217,34 @@ CABINET_TEMPLATES = {
     "tall": TallCabinetTemplate,
 }
 
+_CABINET_TYPE_ERROR = (
+    f"Неизвестный тип корпуса: {{}}. Доступные: {', '.join(CABINET_TEMPLATES)}"
+)
+
 
 def _apply_standard_fasteners(result: CalculationResult, standards: dict[str, Any]) -> None:
     settings = _merge_standards(standards)
-    for panel in result.panels:
-        panel.drilling_points = _convert_fasteners(panel.drilling_points, settings)
-    cups = [
-        point for panel in result.panels
+    panels = result.panels
+    if settings["fastener_type"] == "dowel":
+        for panel in panels:
+            panel.drilling_points = _convert_fasteners(panel.drilling_points, settings)
+    euro_screw = settings["hardware_mount"] == "euro_screw"
+    # Ответные планки нужны только при креплении на евровинт: без него чашки не ищем
+    mounts = _generate_hinge_mount_holes([
+        point for panel in panels
         for point in panel.drilling_points
-        if point.get("hardware_type") == "hinge_cup"
-    ]
-    mounts = _generate_hinge_mount_holes(cups) if settings["hardware_mount"] == "euro_screw" else []
-    for panel in result.panels:
-        if "боковина" not in panel.name.lower() or "ящика" in panel.name.lower():
+        if point.get("hardware_type") == HW_HINGE_CUP
+    ]) if euro_screw else []
+    for panel in panels:
+        name = panel.name.lower()
+        if "боковина" not in name or "ящика" in name:
             continue
-        if settings["hardware_mount"] != "euro_screw":
+        if not euro_screw:
             panel.drilling_points = [
                 point for point in panel.drilling_points
-                if point.get("hardware_type") not in {"hinge_mount", "slide"}
+                if point.get("hardware_type") not in _SCREW_MOUNTED_HARDWARE
             ]
-        panel.drilling_points.extend(mounts)
+        panel.drilling_points.extend(_copy_holes(mounts))
 
 def calculate_panels(
     cabinet_type: str,
@@ -1311,11 +1278,10 @@ def calculate_panels(
     Returns:
         CalculationResult с панелями и предупреждениями
     """
-    template_class = CABINET_TEMPLATES.get(cabinet_type)
-
-    if not template_class:
-        raise ValueError(f"Неизвестный тип корпуса: {cabinet_type}. "
-                        f"Доступные: {', '.join(CABINET_TEMPLATES.keys())}")
+    try:
+        template_class = CABINET_TEMPLATES[cabinet_type]
+    except KeyError:
+        raise ValueError(_CABINET_TYPE_ERROR.format(cabinet_type)) from None
 
     template = template_class(
         width_mm=width_mm,
@@ -1328,7 +1294,9 @@ def calculate_panels(
         facade_color=facade_color,
     )
 
-    log.info(f"[PanelCalculator] Расчёт {cabinet_type} {width_mm}x{height_mm}x{depth_mm}")
+    log.info(
+        "[PanelCalculator] Расчёт %s %sx%sx%s", cabinet_type, width_mm, height_mm, depth_mm
+    )
 
     result = template.calculate(
         shelf_count=shelf_count,
@@ -1346,8 +1314,14 @@ def calculate_panels(
         )
     _apply_standard_fasteners(result, template.standards)
 
-    log.info(f"[PanelCalculator] Результат: {result.total_panels} панелей, "
-             f"{result.total_area_m2:.2f} м2, {len(result.warnings)} предупреждений")
+    # Итоги считаются проходом по всем панелям — только если INFO реально пишется
+    if log.isEnabledFor(logging.INFO):
+        log.info(
+            "[PanelCalculator] Результат: %s панелей, %.2f м2, %s предупреждений",
+            result.total_panels,
+            result.total_area_m2,
+            len(result.warnings),
+        )
 
     return result
 
@@ -12,8 +12,10 @@
 """
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -22,32 +24,57 @@ try:
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
-# Путь к шрифту с кириллицей (DejaVu Sans или системный Arial)
-def _find_cyrillic_font() -> str | None:
-    """Ищет шрифт с поддержкой кириллицы."""
-    candidates = [
-        # Проект (если добавим шрифт)
-        Path(__file__).parent / "fonts" / "DejaVuSans.ttf",
-        # Windows
+# Системные шрифты с кириллицей (DejaVu Sans или Arial) по платформам
+if sys.platform == "win32":
+    _SYSTEM_FONT_CANDIDATES = (
         Path("C:/Windows/Fonts/arial.ttf"),
         Path("C:/Windows/Fonts/tahoma.ttf"),
-        # Linux
-        Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
-        Path("/usr/share/fonts/TTF/DejaVuSans.ttf"),
-        # macOS
+    )
+elif sys.platform == "darwin":
+    _SYSTEM_FONT_CANDIDATES = (
         Path("/System/Library/Fonts/Helvetica.ttc"),
         Path("/Library/Fonts/Arial.ttf"),
-    ]
+    )
+else:
+    _SYSTEM_FONT_CANDIDATES = (
+        Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+        Path("/usr/share/fonts/TTF/DejaVuSans.ttf"),
+    )
+
+
+@lru_cache(maxsize=1)
+def _find_cyrillic_font() -> str | None:
+    """Ищет шрифт с поддержкой кириллицы (один раз, при первой генерации PDF)."""
+    candidates = (
+        # Проект (если добавим шрифт)
+        Path(__file__).parent / "fonts" / "DejaVuSans.ttf",
+        *_SYSTEM_FONT_CANDIDATES,
+    )
     for font_path in candidates:
         if font_path.exists():
             return str(font_path)
     return None
 
-CYRILLIC_FONT_PATH = _find_cyrillic_font()
+
+def __getattr__(name: str) -> str | None:
+    # CYRILLIC_FONT_PATH вычисляется лениво: импорт модуля не ходит по диску
+    if name == "CYRILLIC_FONT_PATH":
+        return _find_cyrillic_font()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 from api.dxf_generator import PlacedPanel
 
 
+@lru_cache(maxsize=1)
+def _load_font() -> fitz.Font:
+    """Шрифт для текста карты: TTF читается и разбирается один раз на процесс."""
+    font_path = _find_cyrillic_font()
+    if font_path:
+        return fitz.Font(fontfile=font_path)
+    # Без шрифта с кириллицей — встроенный Helvetica
+    return fitz.Font("helv")
+
+
 @dataclass
 class PDFConfig:
     """Настройки PDF документа."""
@@ -58,8 +85,7 @@ class PDFConfig:
     # Отступы
     margin: float = 40
 
-    # Шрифты (F0 - кириллический шрифт, регистрируется при генерации)
-    font_cyrillic: str = "F0"  # Имя регистрируемого шрифта с кириллицей
+    # Шрифты
     font_size_title: float = 16
     font_size_subtitle: float = 12
     font_size_panel: float = 8
@@ -75,6 +101,35 @@ class PDFConfig:
     color_cut_line: tuple[float, float, float] = (0.8, 0.2, 0.2)  # Красный для линий реза
 
 
+class _TextLayer:
+    """Текст страницы: копится в TextWriter по цвету и пишется на страницу разом.
+
+    page.insert_text на каждый вызов создаёт и коммитит свой Shape; TextWriter
+    собирает все строки одного цвета в один фрагмент content stream.
+    """
+
+    def __init__(self, page: fitz.Page, font: fitz.Font) -> None:
+        self.page = page
+        self.font = font
+        self._writers: dict[tuple[float, float, float], fitz.TextWriter] = {}
+
+    def add(
+        self,
+        pos: fitz.Point,
+        text: str,
+        fontsize: float,
+        color: tuple[float, float, float],
+    ) -> None:
+        writer = self._writers.get(color)
+        if writer is None:
+            writer = self._writers[color] = fitz.TextWriter(self.page.rect)
+        writer.append(pos, text, font=self.font, fontsize=fontsize)
+
+    def write(self) -> None:
+        for color, writer in self._writers.items():
+            writer.write_text(self.page, color=color)
+
+
 def generate_cutting_map_pdf(
     placed_panels: list[PlacedPanel],
     sheet_width_mm: float,
@@ -106,12 +161,8 @@ def generate_cutting_map_pdf(
     doc = fitz.open()
     page = doc.new_page(width=cfg.page_width, height=cfg.page_height)
 
-    # Регистрируем шрифт с поддержкой кириллицы
-    if CYRILLIC_FONT_PATH:
-        page.insert_font(fontname=cfg.font_cyrillic, fontfile=CYRILLIC_FONT_PATH)
-    else:
-        # Fallback на встроенный шрифт (без кириллицы, но хоть что-то)
-        cfg.font_cyrillic = "helv"
+    font = _load_font()
+    text = _TextLayer(page, font)
 
     # Область для рисования схемы (с учётом отступов и места для заголовка)
     header_height = 60
@@ -137,38 +188,20 @@ def generate_cutting_map_pdf(
     sheet_y = draw_area_y + (draw_area_height - sheet_draw_height) / 2
 
     # --- Заголовок ---
-    _draw_header(page, cfg, order_info)
+    _draw_header(text, cfg, order_info)
 
     # --- Рисуем лист (фон) ---
+    # Все прямоугольники копятся в одном Shape и коммитятся разом: page.draw_rect
+    # на каждый вызов создаёт свой Shape и пересчитывает весь content stream
+    shape = page.new_shape()
     sheet_rect = fitz.Rect(
         sheet_x,
         sheet_y,
         sheet_x + sheet_draw_width,
         sheet_y + sheet_draw_height
     )
-    page.draw_rect(sheet_rect, color=cfg.color_panel_stroke, fill=cfg.color_sheet, width=1.5)
-
-    # --- Размеры листа ---
-    # Ширина сверху
-    page.insert_text(
-        fitz.Point(sheet_x + sheet_draw_width / 2 - 30, sheet_y - 8),
-        f"{int(sheet_width_mm)} мм",
-        fontsize=cfg.font_size_dimension,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
-    )
-
-    # Высота справа (вертикально)
-    height_text_x = sheet_x + sheet_draw_width + 5
-    height_text_y = sheet_y + sheet_draw_height / 2
-    page.insert_text(
-        fitz.Point(height_text_x, height_text_y),
-        f"{int(sheet_height_mm)} мм",
-        fontsize=cfg.font_size_dimension,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
-        rotate=90,
-    )
+    shape.draw_rect(sheet_rect)
+    shape.finish(color=cfg.color_panel_stroke, fill=cfg.color_sheet, width=1.5)
 
     # --- Рисуем панели ---
     panel_colors = [
@@ -182,6 +215,7 @@ def generate_cutting_map_pdf(
         (1.0, 0.85, 0.95),   # Светло-розовый
     ]
 
+    panel_boxes = []
     for i, panel in enumerate(placed_panels):
         color = panel_colors[i % len(panel_colors)]
 
@@ -193,21 +227,52 @@ def generate_cutting_map_pdf(
         panel_h = panel.height_mm * scale
 
         panel_rect = fitz.Rect(panel_x, panel_y, panel_x + panel_w, panel_y + panel_h)
+        panel_boxes.append((panel_x, panel_y, panel_w, panel_h))
 
         # Заливка и контур
-        page.draw_rect(panel_rect, color=cfg.color_panel_stroke, fill=color, width=0.8)
+        shape.draw_rect(panel_rect)
+        shape.finish(color=cfg.color_panel_stroke, fill=color, width=0.8)
+
+    # Подписи идут после коммита, чтобы лечь поверх заливки панелей
+    shape.commit()
+
+    # --- Размеры листа ---
+    # Ширина сверху
+    text.add(
+        fitz.Point(sheet_x + sheet_draw_width / 2 - 30, sheet_y - 8),
+        f"{int(sheet_width_mm)} мм",
+        cfg.font_size_dimension,
+        cfg.color_dimension,
+    )
+
+    # Высота справа (вертикально)
+    # TextWriter поворачивает весь свой текст разом, поэтому у вертикальной подписи свой
+    height_text_pos = fitz.Point(
+        sheet_x + sheet_draw_width + 5,
+        sheet_y + sheet_draw_height / 2,
+    )
+    height_writer = fitz.TextWriter(page.rect)
+    height_writer.append(
+        height_text_pos,
+        f"{int(sheet_height_mm)} мм",
+        font=font,
+        fontsize=cfg.font_size_dimension,
+    )
+    height_writer.write_text(
+        page, color=cfg.color_dimension, morph=(height_text_pos, fitz.Matrix(90)),
+    )
 
+    for panel, (panel_x, panel_y, panel_w, panel_h) in zip(placed_panels, panel_boxes, strict=True):
         # Название панели (если помещается)
         if panel_w > 30 and panel_h > 15:
             name_text = panel.name[:12] + "..." if len(panel.name) > 15 else panel.name
             text_x = panel_x + 3
             text_y = panel_y + 12
-            page.insert_text(
+            text.add(
                 fitz.Point(text_x, text_y),
                 name_text,
-                fontsize=cfg.font_size_panel,
-                fontname=cfg.font_cyrillic,
-                color=cfg.color_text,
+                cfg.font_size_panel,
+                cfg.color_text,
             )
 
         # Размеры панели (если помещается)
@@ -215,29 +280,27 @@ def generate_cutting_map_pdf(
             dim_text = f"{int(panel.width_mm)}×{int(panel.height_mm)}"
             dim_x = panel_x + 3
             dim_y = panel_y + panel_h - 5
-            page.insert_text(
+            text.add(
                 fitz.Point(dim_x, dim_y),
                 dim_text,
-                fontsize=cfg.font_size_dimension,
-                fontname=cfg.font_cyrillic,
-                color=cfg.color_dimension,
+                cfg.font_size_dimension,
+                cfg.color_dimension,
             )
 
         # Индикатор поворота
         if panel.rotated and panel_w > 20 and panel_h > 20:
             rotate_x = panel_x + panel_w - 12
             rotate_y = panel_y + 10
-            page.insert_text(
+            text.add(
                 fitz.Point(rotate_x, rotate_y),
                 "↻",
-                fontsize=10,
-                fontname=cfg.font_cyrillic,
-                color=cfg.color_dimension,
+                10,
+                cfg.color_dimension,
             )
 
     # --- Легенда и статистика ---
     _draw_legend(
-        page, cfg,
+        text, cfg,
         placed_panels,
         sheet_width_mm, sheet_height_mm,
         utilization_percent,
@@ -247,7 +310,9 @@ def generate_cutting_map_pdf(
     )
 
     # --- Футер ---
-    _draw_footer(page, cfg)
+    _draw_footer(text, cfg)
+
+    text.write()
 
     # Сохраняем в bytes
     pdf_bytes = doc.tobytes()
@@ -256,40 +321,37 @@ def generate_cutting_map_pdf(
     return pdf_bytes
 
 
-def _draw_header(page: fitz.Page, cfg: PDFConfig, order_info: str) -> None:
+def _draw_header(text: _TextLayer, cfg: PDFConfig, order_info: str) -> None:
     """Рисует заголовок страницы."""
     # Название
-    page.insert_text(
+    text.add(
         fitz.Point(cfg.margin, cfg.margin + 20),
         "Карта раскроя",
-        fontsize=cfg.font_size_title,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_text,
+        cfg.font_size_title,
+        cfg.color_text,
     )
 
     # Подзаголовок с информацией о заказе
     if order_info:
-        page.insert_text(
+        text.add(
             fitz.Point(cfg.margin, cfg.margin + 38),
             order_info,
-            fontsize=cfg.font_size_subtitle,
-            fontname=cfg.font_cyrillic,
-            color=cfg.color_dimension,
-            )
+            cfg.font_size_subtitle,
+            cfg.color_dimension,
+        )
 
     # Дата
     date_text = datetime.now().strftime("%d.%m.%Y %H:%M")
-    page.insert_text(
+    text.add(
         fitz.Point(cfg.page_width - cfg.margin - 100, cfg.margin + 20),
         date_text,
-        fontsize=cfg.font_size_stats,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
+        cfg.font_size_stats,
+        cfg.color_dimension,
     )
 
 
 def _draw_legend(
-    page: fitz.Page,
+    text: _TextLayer,
     cfg: PDFConfig,
     panels: list[PlacedPanel],
     sheet_w: float,
@@ -304,117 +366,106 @@ def _draw_legend(
     current_y = y
 
     # Заголовок легенды
-    page.insert_text(
+    text.add(
         fitz.Point(x, current_y),
         "Статистика",
-        fontsize=cfg.font_size_subtitle,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_text,
+        cfg.font_size_subtitle,
+        cfg.color_text,
     )
     current_y += line_height + 8
 
     # Размер листа
-    page.insert_text(
+    text.add(
         fitz.Point(x, current_y),
         f"Лист: {int(sheet_w)}x{int(sheet_h)} мм",
-        fontsize=cfg.font_size_stats,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
+        cfg.font_size_stats,
+        cfg.color_dimension,
     )
     current_y += line_height
 
     # Площадь листа
     sheet_area = (sheet_w * sheet_h) / 1_000_000
-    page.insert_text(
+    text.add(
         fitz.Point(x, current_y),
         f"Площадь: {sheet_area:.2f} м2",
-        fontsize=cfg.font_size_stats,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
+        cfg.font_size_stats,
+        cfg.color_dimension,
     )
     current_y += line_height
 
     # Количество панелей
-    page.insert_text(
+    text.add(
         fitz.Point(x, current_y),
         f"Панелей: {len(panels)} шт",
-        fontsize=cfg.font_size_stats,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
+        cfg.font_size_stats,
+        cfg.color_dimension,
     )
     current_y += line_height
 
     # Использование
     util_color = (0.2, 0.6, 0.2) if utilization >= 50 else (0.8, 0.4, 0.1)
-    page.insert_text(
+    text.add(
         fitz.Point(x, current_y),
         f"Использование: {utilization:.1f}%",
-        fontsize=cfg.font_size_stats,
-        fontname=cfg.font_cyrillic,
-        color=util_color,
+        cfg.font_size_stats,
+        util_color,
     )
     current_y += line_height * 2
 
     # Список панелей
-    page.insert_text(
+    text.add(
         fitz.Point(x, current_y),
         "Панели:",
-        fontsize=cfg.font_size_subtitle,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_text,
+        cfg.font_size_subtitle,
+        cfg.color_text,
     )
     current_y += line_height + 4
 
     for i, panel in enumerate(panels[:10]):  # Максимум 10 панелей в легенде
         name = panel.name[:18] + "..." if len(panel.name) > 20 else panel.name
         rotated = " R" if panel.rotated else ""
-        text = f"{i+1}. {name}{rotated}"
-        page.insert_text(
+        label = f"{i+1}. {name}{rotated}"
+        text.add(
             fitz.Point(x, current_y),
-            text,
-            fontsize=cfg.font_size_panel,
-            fontname=cfg.font_cyrillic,
-            color=cfg.color_dimension,
-            )
+            label,
+            cfg.font_size_panel,
+            cfg.color_dimension,
+        )
         current_y += line_height - 2
 
         # Размеры
         dim_text = f"   {int(panel.width_mm)}×{int(panel.height_mm)} мм"
-        page.insert_text(
+        text.add(
             fitz.Point(x, current_y),
             dim_text,
-            fontsize=cfg.font_size_dimension,
-            fontname=cfg.font_cyrillic,
-            color=cfg.color_dimension,
+            cfg.font_size_dimension,
+            cfg.color_dimension,
         )
         current_y += line_height - 2
 
     if len(panels) > 10:
-        page.insert_text(
+        text.add(
             fitz.Point(x, current_y),
             f"... и ещё {len(panels) - 10} панелей",
-            fontsize=cfg.font_size_dimension,
-            fontname=cfg.font_cyrillic,
-            color=cfg.color_dimension,
+            cfg.font_size_dimension,
+            cfg.color_dimension,
         )
 
 
-def _draw_footer(page: fitz.Page, cfg: PDFConfig) -> None:
+def _draw_footer(text: _TextLayer, cfg: PDFConfig) -> None:
     """Рисует футер страницы."""
     footer_y = cfg.page_height - cfg.margin
 
-    page.insert_text(
+    text.add(
         fitz.Point(cfg.margin, footer_y),
         "Сгенерировано: АвтоРаскрой",
-        fontsize=cfg.font_size_dimension,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
+        cfg.font_size_dimension,
+        cfg.color_dimension,
     )
 
-    page.insert_text(
+    text.add(
         fitz.Point(cfg.page_width - cfg.margin - 80, footer_y),
         "avtoraskroy.ru",
-        fontsize=cfg.font_size_dimension,
-        fontname=cfg.font_cyrillic,
-        color=cfg.color_dimension,
+        cfg.font_size_dimension,
+        cfg.color_dimension,
     )
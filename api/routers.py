@@ -389,6 +389,27 @@ def _calculator_standards(factory_settings: dict) -> dict:
         if key in factory_settings and factory_settings[key] is not None
     }
 
+
+def _panel_row(product_id: UUID, spec, material: str | None) -> dict:
+    """Строка для пакетного INSERT в panels из детали калькулятора.
+
+    Панели изделия пишутся одним executemany вместо ORM-объекта на деталь:
+    меньше работы unit of work и один пакетный запрос на изделие.
+    """
+    return {
+        "product_id": product_id,
+        "name": spec.name,
+        "width_mm": spec.width_mm,
+        "height_mm": spec.height_mm,
+        "thickness_mm": spec.thickness_mm,
+        "material": material,
+        "edge_front": spec.edge_front,
+        "edge_back": spec.edge_back,
+        "edge_top": spec.edge_top,
+        "edge_bottom": spec.edge_bottom,
+        "drilling_points": spec.drilling_points,
+    }
+
 def _calculate_fasteners(
     panels: list,
     drawer_count: int,
@@ -702,22 +723,27 @@ async def finalize_order_endpoint(
     db.add(product_config)
     await db.flush()  # Получаем сгенерированный product_config.id
 
-    # Сохраняем панели в таблицу
-    for panel_data in parsed_panels:
-        panel = Panel(
-            product_id=product_config.id,
-            name=panel_data["name"],
-            width_mm=panel_data["width_mm"],
-            height_mm=panel_data["height_mm"],
-            thickness_mm=thickness_mm or 16.0,
-            material=material,
-            edge_front=panel_data.get("edge_front", False),
-            edge_back=panel_data.get("edge_back", False),
-            edge_top=panel_data.get("edge_top", False),
-            edge_bottom=panel_data.get("edge_bottom", False),
-            drilling_points=panel_data.get("drilling_points"),
+    # Сохраняем панели в таблицу одним пакетным INSERT
+    if parsed_panels:
+        await db.execute(
+            insert(Panel),
+            [
+                {
+                    "product_id": product_config.id,
+                    "name": panel_data["name"],
+                    "width_mm": panel_data["width_mm"],
+                    "height_mm": panel_data["height_mm"],
+                    "thickness_mm": thickness_mm or 16.0,
+                    "material": material,
+                    "edge_front": panel_data.get("edge_front", False),
+                    "edge_back": panel_data.get("edge_back", False),
+                    "edge_top": panel_data.get("edge_top", False),
+                    "edge_bottom": panel_data.get("edge_bottom", False),
+                    "drilling_points": panel_data.get("drilling_points"),
+                }
+                for panel_data in parsed_panels
+            ],
         )
-        db.add(panel)
 
     # Обновляем статус заказа
     order.status = "ready"
@@ -789,19 +815,18 @@ async def add_order_product(
         facade_color=params.get("facade_color"),
         standards=_calculator_standards(factory_settings),
     )
-    for spec in result.panels:
-        panel_material = (
-            params.get("facade_color")
-            if spec.name.startswith("Фасад") and params.get("facade_color")
-            else product.material
-        )
-        db.add(Panel(
-            product_id=product.id, name=spec.name, width_mm=spec.width_mm,
-            height_mm=spec.height_mm, thickness_mm=spec.thickness_mm,
-            material=panel_material, edge_front=spec.edge_front,
-            edge_back=spec.edge_back, edge_top=spec.edge_top,
-            edge_bottom=spec.edge_bottom, drilling_points=spec.drilling_points,
-        ))
+    facade_color = params.get("facade_color")
+    await db.execute(
+        insert(Panel),
+        [
+            _panel_row(
+                product.id,
+                spec,
+                facade_color if facade_color and spec.name.startswith("Фасад") else product.material,
+            )
+            for spec in result.panels
+        ],
+    )
     await db.commit()
     return {
         "success": True,
@@ -1166,29 +1191,23 @@ async def recalculate_bom(
         standards=_calculator_standards(factory_settings),
     )
 
-    for panel_spec in calc_result.panels:
-        panel_material = (
-            params.get("facade_color")
-            if panel_spec.name.startswith("Фасад") and params.get("facade_color")
-            else product.material
-        )
-        panel = Panel(
-            product_id=product.id,
-            name=panel_spec.name,
-            width_mm=panel_spec.width_mm,
-            height_mm=panel_spec.height_mm,
-            thickness_mm=panel_spec.thickness_mm,
-            material=panel_material,
-            edge_front=panel_spec.edge_front,
-            edge_back=panel_spec.edge_back,
-            edge_top=panel_spec.edge_top,
-            edge_bottom=panel_spec.edge_bottom,
-            drilling_points=panel_spec.drilling_points,
+    # Пакетный INSERT ... RETURNING: ID новых панелей нужны для ответа
+    facade_color = params.get("facade_color")
+    new_panels = list(
+        await db.scalars(
+            insert(Panel).returning(Panel, sort_by_parameter_order=True),
+            [
+                _panel_row(
+                    product.id,
+                    panel_spec,
+                    facade_color
+                    if facade_color and panel_spec.name.startswith("Фасад")
+                    else product.material,
+                )
+                for panel_spec in calc_result.panels
+            ],
         )
-        db.add(panel)
-        new_panels.append(panel)
-
-    await db.flush()  # Получаем ID для новых панелей
+    )
 
     # Рассчитываем крепёж
     fasteners = _calculate_fasteners(
@@ -1234,15 +1253,13 @@ async def recalculate_bom(
             standards=_calculator_standards(factory_settings),
         )
         await db.execute(sql_delete(Panel).where(Panel.product_id == extra_product.id))
-        for spec in extra_result.panels:
-            db.add(Panel(
-                product_id=extra_product.id, name=spec.name,
-                width_mm=spec.width_mm, height_mm=spec.height_mm,
-                thickness_mm=spec.thickness_mm, material=extra_product.material,
-                edge_front=spec.edge_front, edge_back=spec.edge_back,
-                edge_top=spec.edge_top, edge_bottom=spec.edge_bottom,
-                drilling_points=spec.drilling_points,
-            ))
+        await db.execute(
+            insert(Panel),
+            [
+                _panel_row(extra_product.id, spec, extra_product.material)
+                for spec in extra_result.panels
+            ],
+        )
     await db.commit()
 
     # Approval-flow: пересчёт = новая manufacturing revision (старая approved устаревает)
@@ -1908,17 +1925,11 @@ async def generate_bom_endpoint(
 
             await db.execute(sql_delete(Panel).where(Panel.product_id == product.id))
 
-            # Создаём новые панели
-            for p in panel_result.panels:
-                panel = Panel(
-                    product_id=product.id,
-                    name=p.name,
-                    width_mm=p.width_mm,
-                    height_mm=p.height_mm,
-                    thickness_mm=p.thickness_mm,
-                    material=req.material,
-                )
-                db.add(panel)
+            # Создаём новые панели одним пакетным INSERT
+            await db.execute(
+                insert(Panel),
+                [_panel_row(product.id, spec, req.material) for spec in panel_result.panels],
+            )
 
             await db.commit()
 
@@ -3207,7 +3218,7 @@ async def dialogue_clarify(
     messages = [{"role": "system", "content": system_prompt_text}]
 
     # Добавляем историю из БД (предыдущие сообщения)
-    for msg in sorted(order.dialogue_messages, key=lambda m: m.turn_number):
+    for msg in order.dialogue_messages:
         messages.append({"role": msg.role, "content": msg.content})
 
     # ВАЖНО: Добавляем текущее сообщение пользователя (оно уже сохранено в БД, но ещё не в order.dialogue_messages)
@@ -3313,7 +3324,7 @@ async def dialogue_clarify_with_tools(
     # Собираем историю сообщений
     messages = [{"role": "system", "content": system_prompt_text}]
 
-    for msg in sorted(order.dialogue_messages, key=lambda m: m.turn_number):
+    for msg in order.dialogue_messages:
         messages.append({"role": msg.role, "content": msg.content})
 
     if user_message_text:
@@ -13,10 +13,14 @@ import asyncio
 import logging
 from datetime import UTC, datetime
 
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import defer
 
 from api.database import SessionLocal
 from api.models import HardwareItem
+from api.vector_search import bump_search_cache_generation, close_search_cache
 from shared.embeddings import (
     get_embed_version,
     _content_fingerprint,
@@ -27,6 +31,50 @@ from shared.embeddings import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_STAGE_COLUMNS = ("id", "embedding", "embedding_version", "content_hash", "indexed_at")
+
+
+def _vector_literal(values: list[float]) -> str:
+    """Текстовое представление вектора pgvector: [0.1,0.2,...]."""
+    return "[" + ",".join(map(str, values)) + "]"
+
+
+async def _write_embeddings(session: AsyncSession, records: list[tuple]) -> None:
+    """Записывает векторы одним COPY во временную таблицу и одним UPDATE ... FROM.
+
+    Построчный UPDATE гоняет по сети каждый вектор отдельным запросом;
+    COPY передаёт весь пакет одним потоком. Вектор идёт текстом и
+    приводится к halfvec уже на сервере — кодек pgvector для asyncpg
+    регистрировать не нужно.
+    """
+    conn = await session.connection()
+    await conn.execute(text(
+        """
+        CREATE TEMP TABLE hw_embedding_stage (
+            id uuid PRIMARY KEY,
+            embedding text NOT NULL,
+            embedding_version varchar(40),
+            content_hash varchar(64),
+            indexed_at timestamptz
+        ) ON COMMIT DROP
+        """
+    ))
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "hw_embedding_stage", records=records, columns=_STAGE_COLUMNS
+    )
+    await conn.execute(text(
+        """
+        UPDATE hardware_items AS h
+        SET embedding = s.embedding::halfvec,
+            embedding_version = s.embedding_version,
+            content_hash = s.content_hash,
+            indexed_at = s.indexed_at
+        FROM hw_embedding_stage AS s
+        WHERE h.id = s.id
+        """
+    ))
+
 
 async def main(
     limit: int | None = None,
@@ -41,17 +89,22 @@ async def main(
         batch_size: Размер батча (по умолчанию 64)
         force: Перегенерировать все, даже актуальные
     """
+    embed_version = get_embed_version()
     logger.info("Запуск создания embeddings через AI API...")
-    logger.info(f"Версия модели: {get_embed_version()}")
+    logger.info(f"Версия модели: {embed_version}")
 
     async with SessionLocal() as session:
-        # Выбираем элементы
-        q = select(HardwareItem)
+        # Сами векторы для проверки актуальности не нужны — только факт их наличия.
+        # defer не тянет килобайты embedding на каждую строку каталога.
+        q = select(
+            HardwareItem, HardwareItem.embedding.isnot(None).label("has_embedding")
+        ).options(defer(HardwareItem.embedding))
         if limit:
             q = q.limit(limit)
 
         res = await session.execute(q)
-        items: list[HardwareItem] = list(res.scalars())
+        rows = res.all()
+        items: list[HardwareItem] = [row[0] for row in rows]
 
         logger.info(f"Найдено {len(items)} позиций")
 
@@ -60,20 +113,19 @@ async def main(
         texts: list[str] = []
         fingerprints: list[str] = []
 
-        for item in items:
-            text = concat_hardware_item_text(item)
+        for item, has_embedding in rows:
             fingerprint = _content_fingerprint(item)
 
             # Пропускаем если embedding уже актуален (и не force)
             if not force and (
-                item.embedding is not None
+                has_embedding
                 and item.content_hash == fingerprint
-                and item.embedding_version == get_embed_version()
+                and item.embedding_version == embed_version
             ):
                 continue
 
             items_to_process.append(item)
-            texts.append(text)
+            texts.append(concat_hardware_item_text(item))
             fingerprints.append(fingerprint)
 
         skipped_count = len(items) - len(items_to_process)
@@ -83,8 +135,9 @@ async def main(
             logger.info("Все embeddings актуальны!")
             return
 
-        # Batch-генерация через API
+        # Batch-генерация через API; в БД пишем всё разом после генерации
         logger.info(f"Batch-генерация embeddings (batch_size={batch_size})...")
+        records: list[tuple] = []
 
         for i in range(0, len(texts), batch_size):
             batch_texts = texts[i : i + batch_size]
@@ -99,24 +152,27 @@ async def main(
 
             try:
                 embeddings = await embed_batch(batch_texts)
-
-                for item, emb, fingerprint in zip(
-                    batch_items, embeddings, batch_fingerprints, strict=True
-                ):
-                    item.embedding = emb
-                    item.embedding_version = get_embed_version()
-                    item.content_hash = fingerprint
-                    item.indexed_at = datetime.now(UTC)
-
-                await session.flush()
+                indexed_at = datetime.now(UTC)
+
+                records.extend(
+                    (item.id, _vector_literal(emb), embed_version, fingerprint, indexed_at)
+                    for item, emb, fingerprint in zip(
+                        batch_items, embeddings, batch_fingerprints, strict=True
+                    )
+                )
                 logger.info("Батч обработан успешно")
 
             except Exception as e:
                 logger.error(f"Ошибка батча: {e}")
                 # Продолжаем со следующим батчем
 
+        if records:
+            await _write_embeddings(session, records)
         await session.commit()
-        logger.info(f"Готово! Обработано: {len(items_to_process)}")
+        if records:
+            await bump_search_cache_generation()
+            await close_search_cache()
+        logger.info(f"Готово! Обработано: {len(records)}")
 
 
 if __name__ == "__main__":
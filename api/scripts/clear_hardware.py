@@ -4,6 +4,7 @@ import logging
 
 from api.database import SessionLocal
 from api.models import HardwareItem
+from api.vector_search import bump_search_cache_generation, close_search_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,6 +14,8 @@ async def main():
     async with SessionLocal() as session:
         await session.execute(HardwareItem.__table__.delete())
         await session.commit()
+    await bump_search_cache_generation()
+    await close_search_cache()
     logger.info("Hardware items cleared.")
 
 if __name__ == "__main__":
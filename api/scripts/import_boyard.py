@@ -16,6 +16,7 @@ from sqlalchemy import delete, text
 
 from api.database import SessionLocal
 from api.models import HardwareItem
+from api.vector_search import bump_search_cache_generation, close_search_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -236,6 +237,10 @@ async def main():
         created, skipped = await import_items(all_items, db)
         logger.info(f"Создано: {created}, пропущено: {skipped}")
 
+    # Каталог заменён целиком — закэшированные результаты поиска больше не верны
+    await bump_search_cache_generation()
+    await close_search_cache()
+
     logger.info("=" * 60)
     logger.info("Импорт завершён!")
     logger.info("Следующий шаг: uv run python -m api.scripts.backfill_embeddings")
@@ -8,6 +8,11 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "furniture_ai"
     POSTGRES_USER: str = "app"
     POSTGRES_PASSWORD: str = "app"
+    # Пул соединений на процесс (api и каждый воркер держат свой).
+    # pool_size + max_overflow на все процессы должно влезать в max_connections.
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 20
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 1800
 
     # Redis
     REDIS_URL: str = "redis://localhost:6380/0"
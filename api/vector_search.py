@@ -1,12 +1,106 @@
-
+import hashlib
+import json
+import logging
 from typing import Any
+from uuid import UUID
 
+import redis.asyncio as aioredis
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import defer
 
 from api.database import SessionLocal
 from api.models import HardwareItem
+from api.settings import settings
 from shared.embeddings import embed_query
 
+log = logging.getLogger(__name__)
+
+# Размер списка кандидатов HNSW (дефолт pgvector). HNSW не вернёт больше
+# ef_search строк, поэтому для больших k поднимаем его до k.
+HNSW_EF_SEARCH = 40
+
+# Кэш текстового поиска: нормализованный запрос → id найденных позиций.
+# Поколение каталога увеличивает backfill embeddings — старые ключи
+# перестают совпадать и просто истекают по TTL.
+SEARCH_CACHE_TTL_SECONDS = 3600
+SEARCH_CACHE_GENERATION_KEY = "hwsearch:gen"
+# Кэш — только ускорение: зависший Redis не должен тормозить поиск,
+# поэтому таймауты короткие, а ошибка означает поход в БД
+SEARCH_CACHE_SOCKET_TIMEOUT_SECONDS = 0.25
+
+_search_cache_client: AsyncRedis | None = None
+
+
+def _search_cache() -> AsyncRedis:
+    """Общий на процесс клиент Redis для кэша поиска (один пул соединений)."""
+    global _search_cache_client
+    if _search_cache_client is None:
+        _search_cache_client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=SEARCH_CACHE_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=SEARCH_CACHE_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _search_cache_client
+
+
+async def close_search_cache() -> None:
+    """Закрыть клиент кэша поиска (при остановке приложения или скрипта)."""
+    global _search_cache_client
+    client, _search_cache_client = _search_cache_client, None
+    if client is not None:
+        await client.aclose()
+
+
+async def set_hnsw_ef_search(db: AsyncSession, k: int) -> None:
+    """Задаёт hnsw.ef_search на текущую транзакцию (аналог SET LOCAL)."""
+    await db.execute(
+        text("SELECT set_config('hnsw.ef_search', :value, true)"),
+        {"value": str(max(HNSW_EF_SEARCH, k))},
+    )
+
+
+def search_cache_key(
+    query_text: str, k: int, filters: dict[str, Any] | None, generation: str
+) -> str:
+    """Ключ кэша: регистр и пробелы запроса не влияют, порядок фильтров тоже."""
+    payload = json.dumps(
+        {
+            "q": " ".join(query_text.lower().split()),
+            "k": k,
+            "f": sorted((filters or {}).items()),
+            "g": generation,
+        },
+        ensure_ascii=False,
+        default=str,
+    )
+    return "hwsearch:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def bump_search_cache_generation() -> None:
+    """Инвалидирует кэш поиска после переиндексации каталога."""
+    try:
+        await _search_cache().incr(SEARCH_CACHE_GENERATION_KEY)
+    except Exception as e:
+        log.warning("Не удалось сбросить кэш поиска фурнитуры: %s", e)
+
+
+async def _load_items_in_order(ids: list[str]) -> list[HardwareItem] | None:
+    """Позиции из кэша в исходном порядке; None, если часть уже удалена."""
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(HardwareItem)
+            .options(defer(HardwareItem.embedding))
+            .where(HardwareItem.id.in_([UUID(i) for i in ids]))
+        )
+        by_id = {str(item.id): item for item in result.scalars()}
+    if len(by_id) != len(ids):
+        return None
+    return [by_id[i] for i in ids]
+
 
 async def find_similar_hardware(
     embedding: list[float],
@@ -22,6 +116,7 @@ async def find_similar_hardware(
                 if hasattr(HardwareItem, key):
                     query = query.filter(getattr(HardwareItem, key) == value)
 
+        await set_hnsw_ef_search(db, k)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -34,6 +129,33 @@ async def search_hardware_by_text(
     """
     Поиск фурнитуры по текстовому запросу.
     Использует text-search-query модель для embedding запроса.
+
+    Повторный запрос (с точностью до регистра и пробелов) отдаётся из Redis
+    без генерации embedding и ANN-поиска. Недоступный Redis не мешает поиску.
     """
+    redis = None
+    key = None
+    try:
+        redis = _search_cache()
+        generation = await redis.get(SEARCH_CACHE_GENERATION_KEY) or "0"
+        key = search_cache_key(query_text, k, filters, generation)
+        cached = await redis.get(key)
+        if cached is not None:
+            items = await _load_items_in_order(json.loads(cached))
+            if items is not None:
+                return items
+    except Exception as e:
+        log.warning("Кэш поиска фурнитуры недоступен: %s", e)
+        key = None
+
     query_embedding = await embed_query(query_text)
-    return await find_similar_hardware(query_embedding, k=k, filters=filters)
+    items = await find_similar_hardware(query_embedding, k=k, filters=filters)
+
+    if redis is not None and key is not None:
+        try:
+            await redis.set(
+                key, json.dumps([str(item.id) for item in items]), ex=SEARCH_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            log.warning("Не удалось сохранить результат поиска в кэш: %s", e)
+    return items
@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.database import SessionLocal
 from api.models import HardwareItem
+from api.vector_search import bump_search_cache_generation, close_search_cache
 from shared.embeddings import concat_hardware_item_text, embed_text, get_embed_version
 
 Embedder = Callable[[str], Awaitable[list[float]]]
@@ -176,6 +177,9 @@ async def load_items(
     finally:
         if own_session:
             await active_session.close()
+    if report.written and (report.added or report.updated):
+        # Новые и изменённые позиции должны попадать в поиск сразу, а не через TTL
+        await bump_search_cache_generation()
     return report
 
 
@@ -186,12 +190,19 @@ async def load_file(path: Path, *, dry_run: bool = False) -> LoadReport:
     return await load_items(items, dry_run=dry_run)
 
 
+async def _load_file_and_close(path: Path, *, dry_run: bool) -> LoadReport:
+    try:
+        return await load_file(path, dry_run=dry_run)
+    finally:
+        await close_search_cache()
+
+
 def _main() -> None:
     parser = argparse.ArgumentParser(description="Загрузка каталога в hardware_items")
     parser.add_argument("path", type=Path)
     parser.add_argument("--dry-run", action="store_true", help="только показать изменения")
     args = parser.parse_args()
-    report = asyncio.run(load_file(args.path, dry_run=args.dry_run))
+    report = asyncio.run(_load_file_and_close(args.path, dry_run=args.dry_run))
     mode = "сухой прогон" if args.dry_run else "запись"
     print(
         f"{mode}: добавится {report.added}, обновится {report.updated}, "
@@ -1,13 +1,33 @@
-"""Shared utilities package."""
+"""Shared utilities package.
 
-from shared.ai_client import (
-    AIClient,
-    GPTResponse,
-    GPTResponseWithTools,
-    ToolCall,
-    get_ai_client,
-)
-from shared.ai_settings import AISettings
+Реэкспорты загружаются лениво (PEP 562): импорт лёгких подмодулей вроде
+``shared.embeddings`` или ``shared.storage`` не тянет aiohttp через
+``shared.ai_client``, пока клиент действительно не понадобился.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from shared.ai_client import (
+        AIClient,
+        GPTResponse,
+        GPTResponseWithTools,
+        ToolCall,
+        get_ai_client,
+    )
+    from shared.ai_settings import AISettings
+
+_LAZY_EXPORTS = {
+    "AIClient": "shared.ai_client",
+    "AISettings": "shared.ai_settings",
+    "GPTResponse": "shared.ai_client",
+    "GPTResponseWithTools": "shared.ai_client",
+    "ToolCall": "shared.ai_client",
+    "get_ai_client": "shared.ai_client",
+}
 
 __all__ = [
     "AIClient",
@@ -17,3 +37,12 @@ __all__ = [
     "ToolCall",
     "get_ai_client",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
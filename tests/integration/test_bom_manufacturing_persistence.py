@@ -419,3 +419,31 @@ class TestRegressionDataLoss:
 
         for panel in loaded.spec["panels"]:
             assert panel["material"] == "ЛДСП"
+
+
+# ---------------------------------------------------------------------------
+# Tests — order loading strategy
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.integration
+class TestOrderLoading:
+    """get_order_with_products грузит только изделия, прочие связи закрыты."""
+
+    async def test_products_loaded_other_relations_raise(self, db: AsyncSession) -> None:
+        from sqlalchemy.exc import InvalidRequestError
+
+        from api.crud import get_order_with_products
+
+        db.add(models.ProductConfig(order_id=ORDER_ID, name="Модуль", width_mm=600,
+                                    height_mm=720, depth_mm=560))
+        await db.commit()
+        db.expunge_all()
+
+        order = await get_order_with_products(db, ORDER_ID)
+
+        assert [p.name for p in order.products] == ["Модуль"]
+        with pytest.raises(InvalidRequestError):
+            _ = order.factory
+        with pytest.raises(InvalidRequestError):
+            _ = order.products[0].panels
@@ -278,3 +278,70 @@ class TestHealthEndpoint:
 
         # status может быть "ok" или "healthy"
         assert data["status"] in ("ok", "healthy")
+
+
+class TestAppAssembly:
+    """Сборка приложения: один модуль, без дублирования middleware."""
+
+    def test_each_middleware_registered_once(self):
+        """Каждый middleware (для функций — каждый dispatch) висит на app ровно один раз."""
+        from collections import Counter
+
+        import api.main as main_mod
+
+        registered = Counter(
+            (m.cls, m.kwargs.get("dispatch")) for m in main_mod.app.user_middleware
+        )
+        duplicated = {
+            f"{cls.__name__}:{getattr(dispatch, '__name__', '')}": count
+            for (cls, dispatch), count in registered.items()
+            if count > 1
+        }
+        assert not duplicated
+
+    async def test_logs_after_lifespan_cycles_are_emitted(self, monkeypatch):
+        """После остановки приложения (и повторного запуска) логи не застревают в очереди."""
+        import logging
+        import threading
+
+        import api.main as main_mod
+
+        async def noop() -> None:
+            return None
+
+        monkeypatch.setattr(main_mod, "_validate_runtime", noop)
+        monkeypatch.setattr(main_mod, "_preload_heavy_modules", noop)
+        monkeypatch.setattr(main_mod, "shutdown_event", noop)
+
+        for _ in range(2):
+            async with main_mod._lifespan(main_mod.app):
+                pass
+
+        emitted = threading.Event()
+
+        class _Capture(logging.Handler):
+            def emit(self, record: logging.LogRecord) -> None:
+                if record.getMessage() == "after lifespan":
+                    emitted.set()
+
+        capture = _Capture()
+        monkeypatch.setattr(
+            main_mod._log_listener, "handlers", (*main_mod._log_listener.handlers, capture)
+        )
+        logging.getLogger("api.test").warning("after lifespan")
+
+        assert emitted.wait(timeout=2)
+
+    async def test_cors_preflight_allows_guest_headers(self, client: AsyncClient):
+        """Preflight пропускает гостевые заголовки и кэшируется браузером."""
+        response = await client.options(
+            "/api/v1/panels/calculate",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type, x-guest-capability",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["access-control-max-age"] == "86400"
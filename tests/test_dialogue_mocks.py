@@ -0,0 +1,86 @@
+"""Тесты mock-инструментов диалога."""
+
+import json
+from collections import OrderedDict
+
+import pytest
+
+from api.mocks import dialogue_mocks
+from api.mocks.dialogue_mocks import (
+    MOCK_HARDWARE_SEARCH_RESULTS,
+    get_dialogue_state,
+    mock_function_call_response,
+)
+
+
+@pytest.fixture
+def dialogue_clock(monkeypatch):
+    """Пустой кэш состояний на 2 заказа и управляемые часы."""
+    clock = [1000.0]
+    monkeypatch.setattr(dialogue_mocks, "_dialogue_states", OrderedDict())
+    monkeypatch.setattr(dialogue_mocks, "DIALOGUE_STATES_MAX_SIZE", 2)
+    monkeypatch.setattr(dialogue_mocks.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+@pytest.mark.parametrize(
+    ("function_name", "kwargs"),
+    [
+        ("get_available_materials", {"panel_type": "корпус"}),
+        ("get_material_properties", {"material_name": "ЛДСП Egger"}),
+        ("check_hardware_compatibility", {"panel_thickness": 18, "hardware_sku": "BLUM-123"}),
+        ("find_hardware", {"query": "петля накладная blum"}),
+    ],
+)
+async def test_tool_results_are_json_serializable(function_name, kwargs):
+    """Результат инструмента уходит в модель через json.dumps."""
+    result = await mock_function_call_response(function_name, **kwargs)
+
+    assert json.loads(json.dumps(result, ensure_ascii=False)) == result
+
+
+async def test_tool_result_mutation_does_not_touch_constants():
+    """Правка результата не меняет статические ответы модуля."""
+    result = await mock_function_call_response("find_hardware", query="петля")
+    result[0]["цена"] = 0
+    result.clear()
+
+    again = await mock_function_call_response("find_hardware", query="петля")
+    assert len(again) == len(MOCK_HARDWARE_SEARCH_RESULTS)
+    assert again[0]["цена"] == MOCK_HARDWARE_SEARCH_RESULTS[0]["цена"]
+
+
+def test_dialogue_state_evicts_oldest(dialogue_clock):
+    """При переполнении вытесняется давно не использованный заказ."""
+    first = get_dialogue_state(1)
+    get_dialogue_state(2)
+    assert get_dialogue_state(1) is first
+
+    get_dialogue_state(3)
+
+    assert list(dialogue_mocks._dialogue_states) == [1, 3]
+
+
+def test_expired_dialogue_state_is_recreated(dialogue_clock):
+    """Состояние старше TTL заменяется новым."""
+    stale = get_dialogue_state(1)
+    stale.get_next_stage()
+
+    dialogue_clock[0] += dialogue_mocks.DIALOGUE_STATE_TTL_SECONDS
+
+    fresh = get_dialogue_state(1)
+    assert fresh is not stale
+    assert fresh.stage_index == 0
+
+
+def test_refreshed_expired_state_survives_next_eviction(dialogue_clock):
+    """Пересозданное после TTL состояние становится самым свежим в LRU."""
+    get_dialogue_state(1)
+    get_dialogue_state(2)
+    dialogue_clock[0] += dialogue_mocks.DIALOGUE_STATE_TTL_SECONDS
+    refreshed = get_dialogue_state(1)
+
+    get_dialogue_state(3)
+
+    assert list(dialogue_mocks._dialogue_states) == [1, 3]
+    assert get_dialogue_state(1) is refreshed
@@ -120,6 +120,18 @@ class TestWallCabinet:
 
         assert any("конструкционной полкой" in warning.lower() for warning in result.warnings)
 
+    def test_repeated_calculation_does_not_share_drilling(self):
+        """Правка присадки одного расчёта не попадает в следующий такой же."""
+        first = calculate_panels(cabinet_type="wall", width_mm=600, height_mm=720, depth_mm=300)
+        side = next(p for p in first.panels if p.name == "Боковина левая")
+        side.drilling_points[0]["x"] = -1.0
+        side.drilling_points.clear()
+
+        second = calculate_panels(cabinet_type="wall", width_mm=600, height_mm=720, depth_mm=300)
+        side = next(p for p in second.panels if p.name == "Боковина левая")
+        assert side.drilling_points
+        assert all(hole["x"] >= 0 for hole in side.drilling_points)
+
 
 
 class TestBaseCabinet:
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from api import vector_search
+from api.vector_search import search_cache_key
+
+
+def test_cache_key_ignores_case_and_whitespace() -> None:
+    assert search_cache_key("Петля  110 градусов", 10, None, "0") == search_cache_key(
+        " петля 110 ГРАДУСОВ ", 10, None, "0"
+    )
+
+
+def test_cache_key_ignores_filter_order() -> None:
+    assert search_cache_key("ручка", 5, {"type": "handle", "brand": "BOYARD"}, "0") == (
+        search_cache_key("ручка", 5, {"brand": "BOYARD", "type": "handle"}, "0")
+    )
+
+
+def test_cache_key_changes_with_k_and_generation() -> None:
+    base = search_cache_key("ручка", 5, None, "0")
+    assert search_cache_key("ручка", 10, None, "0") != base
+    assert search_cache_key("ручка", 5, None, "1") != base
+
+
+class _HungRedis:
+    async def get(self, key: str) -> str | None:
+        raise RedisTimeoutError("Timeout reading from socket")
+
+    async def set(self, *args, **kwargs) -> None:
+        raise AssertionError("после ошибки Redis запись в кэш не нужна")
+
+
+async def test_search_falls_through_to_db_when_cache_times_out(monkeypatch) -> None:
+    found = [object()]
+
+    async def fake_embed(text: str) -> list[float]:
+        return [0.0]
+
+    async def fake_find(embedding, k=10, filters=None):
+        return found
+
+    monkeypatch.setattr(vector_search, "_search_cache", lambda: _HungRedis())
+    monkeypatch.setattr(vector_search, "embed_query", fake_embed)
+    monkeypatch.setattr(vector_search, "find_similar_hardware", fake_find)
+
+    assert await vector_search.search_hardware_by_text("петля") is found
+
+
+async def test_search_cache_client_is_shared_and_closed() -> None:
+    client = vector_search._search_cache()
+    try:
+        assert vector_search._search_cache() is client
+        pool_kwargs = client.connection_pool.connection_kwargs
+        assert pool_kwargs["socket_timeout"] == vector_search.SEARCH_CACHE_SOCKET_TIMEOUT_SECONDS
+        assert pool_kwargs["socket_connect_timeout"] == (
+            vector_search.SEARCH_CACHE_SOCKET_TIMEOUT_SECONDS
+        )
+    finally:
+        await vector_search.close_search_cache()
+    assert vector_search._search_cache() is not client
+    await vector_search.close_search_cache()